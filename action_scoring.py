@@ -0,0 +1,124 @@
+import numpy as np
+
+from type_effectiveness import BattleMemo, battle_type_chart, type_index
+
+# Columns of the feature matrix; one row per available move or switch
+FEATURES = (
+    'base_power',        # raw base power (moves)
+    'expected_damage',   # base power × effectiveness × STAB × accuracy (moves)
+    'priority',          # 1 for priority moves
+    'status_vs_healthy', # 1 for status moves into an opponent above 70% HP
+    'switch',            # 1 for switches (a switching bias)
+    'switch_hp',         # HP fraction of the switch target
+    'resisted_moves',    # opponent's known moves the switch target resists
+)
+
+# Reproduces SmartHeuristicPlayer's hand-written scores, but lets switches
+# compete with moves instead of only being used when no move is available.
+# Expected damage is in base-power units (a neutral 90-power STAB hit is 135),
+# and a switch scores -150 + 100·HP + 50·resisted moves: a healthy switch-in
+# resisting two known moves (50) beats only resisted, immune or status moves
+SMART_HEURISTIC_WEIGHTS = np.array([0.0, 1.0, 50.0, 30.0, -150.0, 100.0, 50.0])
+
+# Reproduces MaxDamagePlayer: strongest move; healthiest switch only if no move
+MAX_DAMAGE_WEIGHTS = np.array([1.0, 0.0, 0.0, 0.0, -1000.0, 1.0, 0.0])
+
+
+class ActionScorer:
+    """
+    Score every available move and switch in one pass.
+
+    The options of a turn are encoded into a small (options, features) array
+    and scored with a single matrix-vector product against a weight vector, so
+    the same evaluator backs different bots and the weights can be tuned.
+    Features whose weight is zero are not computed. Passing a bot's per-battle
+    BattleMemo reuses its effectiveness table and its cache of switch
+    matchups across turns; without one a throwaway memo is used.
+    """
+
+    def __init__(self, weights=SMART_HEURISTIC_WEIGHTS):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        if self.weights.shape != (len(FEATURES),):
+            raise ValueError(f"Expected {len(FEATURES)} weights, one per feature: {FEATURES}")
+        self._needed = self.weights != 0
+
+    def encode(self, battle, memo=None):
+        """Return (options, features) for the current turn"""
+        moves = list(battle.available_moves)
+        switches = list(battle.available_switches)
+        features = np.zeros((len(moves) + len(switches), len(FEATURES)))
+        if memo is None and (moves or switches):
+            memo = BattleMemo(battle_type_chart(battle))
+        if moves:
+            self._encode_moves(moves, battle, memo, features[:len(moves)])
+        if switches:
+            self._encode_switches(switches, battle, memo, features[len(moves):])
+        return moves + switches, features
+
+    def score(self, features):
+        return features @ self.weights
+
+    def choose(self, battle, memo=None):
+        """Best move or switch, or None when there is nothing to choose from"""
+        options, features = self.encode(battle, memo)
+        if not options:
+            return None
+        return options[int(np.argmax(self.score(features)))]
+
+    def _encode_moves(self, moves, battle, memo, out):
+        active = battle.active_pokemon
+        opponent = battle.opponent_active_pokemon
+
+        base_power = np.array([move.base_power or 0 for move in moves], dtype=np.float64)
+        out[:, 0] = base_power
+
+        if self._needed[1]:
+            # poke_env's accuracy is already a 0-1 hit chance (1.0 for moves that never miss)
+            accuracy = np.array([move.accuracy if move.accuracy else 1.0 for move in moves])
+            own_types = {active.type_1, active.type_2} if active else set()
+            stab = np.array([1.5 if move.type in own_types else 1.0 for move in moves])
+            effectiveness = np.ones(len(moves))
+            if opponent:
+                effectiveness = _effectiveness(
+                    memo, [move.type for move in moves], opponent.type_1, opponent.type_2)
+            out[:, 1] = base_power * effectiveness * stab * accuracy
+
+        if self._needed[2]:
+            out[:, 2] = [move.priority > 0 for move in moves]
+
+        if self._needed[3] and opponent and opponent.current_hp_fraction > 0.7:
+            out[:, 3] = [move.category.name == "STATUS" for move in moves]
+
+    def _encode_switches(self, switches, battle, memo, out):
+        out[:, 4] = 1.0
+        out[:, 5] = [pokemon.current_hp_fraction for pokemon in switches]
+
+        opponent = battle.opponent_active_pokemon
+        if not (self._needed[6] and opponent and opponent.moves):
+            return
+
+        # The battle already holds Move objects for the opponent's known moves
+        move_types = [move.type for move in opponent.moves.values() if move.type]
+        if not move_types:
+            return
+        # Resisted-move counts are memoized per (switch, opponent, known moves)
+        known = (opponent.species, tuple(opponent.moves))
+        for i, pokemon in enumerate(switches):
+            key = (pokemon.species,) + known
+            resisted = memo.matchups.get(key)
+            if resisted is None:
+                multipliers = _effectiveness(memo, move_types, pokemon.type_1, pokemon.type_2)
+                resisted = memo.matchups[key] = int((multipliers < 1).sum())
+            out[i, 6] = resisted
+
+
+def _effectiveness(memo, move_types, type_1, type_2):
+    """Multipliers of several attacking types against one defender"""
+    attack = np.array([type_index(move_type) for move_type in move_types])
+    d1 = type_index(type_1)
+    d2 = type_index(type_2) if type_2 is not None else d1
+    if d1 < 0 or d2 < 0 or (attack < 0).any():
+        # Types outside the 18-type table go through poke_env's own lookup
+        return np.array([memo.multiplier(move_type, type_1, type_2) for move_type in move_types],
+                        dtype=np.float64)
+    return memo.table[attack, d1, d2]
@@ -0,0 +1,92 @@
+import numpy as np
+
+OBSERVATION_SIZE = 100
+STAT_KEYS = ('atk', 'def', 'spa', 'spd', 'spe')
+WEATHERS = ('raindance', 'sunnyday', 'sandstorm', 'hail')
+
+# Fixed float32 layout; every slot has exactly one writer
+ACTIVE_HP = 0                # active Pokémon HP fraction
+ACTIVE_STATS = slice(1, 6)   # active base atk/def/spa/spd/spe / 200
+OPP_HP = 6                   # opponent active HP fraction
+OPP_STATS = slice(7, 12)     # opponent active base stats / 200
+MOVE_POWER = 12              # 12-15: available move base power / 150
+MOVE_ACCURACY = 16           # 16-19: accuracy (1.0 if it never misses)
+MOVE_PP = 20                 # 20-23: remaining PP fraction
+TEAM_HP = 24                 # 24-29: own team HP fractions
+OPP_TEAM_HP = 30             # 30-35: revealed opponent HP fractions (1.0 if unknown)
+WEATHER = 36                 # 36-39: one-hot WEATHERS
+# 40-99 are reserved and always zero
+
+STAT_SCALE = 200.0
+POWER_SCALE = 150.0
+
+
+class BattleEncoder:
+    """
+    Float32 battle observation writer for RLPlayer.
+
+    encode() fills a caller-provided (100,) buffer in place and encode_batch()
+    fills rows of an (n_envs, 100) array, so vectorized rollouts reuse the
+    same memory every turn. Values are clipped to the [-1, 1] observation box.
+    """
+
+    size = OBSERVATION_SIZE
+
+    def encode(self, battle, out=None):
+        if out is None:
+            out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        else:
+            out.fill(0.0)
+
+        active = battle.active_pokemon
+        if active:
+            out[ACTIVE_HP] = active.current_hp_fraction
+            _write_stats(active.base_stats, out, ACTIVE_STATS.start)
+
+        opponent = battle.opponent_active_pokemon
+        if opponent:
+            out[OPP_HP] = opponent.current_hp_fraction
+            _write_stats(opponent.base_stats, out, OPP_STATS.start)
+
+        for i, move in enumerate(battle.available_moves[:4]):
+            if move.base_power:
+                out[MOVE_POWER + i] = move.base_power / POWER_SCALE
+            # poke_env's accuracy is already a 0-1 hit chance
+            out[MOVE_ACCURACY + i] = move.accuracy if move.accuracy else 1.0
+            out[MOVE_PP + i] = move.current_pp / move.max_pp if move.max_pp else 0.0
+
+        for i, pokemon in enumerate(battle.team.values()):
+            if i >= 6:
+                break
+            out[TEAM_HP + i] = pokemon.current_hp_fraction
+
+        for i, pokemon in enumerate(battle.opponent_team.values()):
+            if i >= 6:
+                break
+            fraction = pokemon.current_hp_fraction
+            out[OPP_TEAM_HP + i] = 1.0 if fraction is None else fraction
+
+        weather = battle.weather
+        if weather:
+            # poke_env reports {Weather: start turn}; plain strings are accepted too
+            names = (weather,) if isinstance(weather, str) else weather
+            for name in names:
+                name = getattr(name, 'name', name).lower()
+                if name in WEATHERS:
+                    out[WEATHER + WEATHERS.index(name)] = 1.0
+
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    def encode_batch(self, battles, out=None):
+        """Fill row i of an (n, 100) float32 array with battle i"""
+        if out is None:
+            out = np.zeros((len(battles), OBSERVATION_SIZE), dtype=np.float32)
+        for row, battle in zip(out, battles):
+            self.encode(battle, row)
+        return out
+
+
+def _write_stats(base_stats, out, start):
+    for offset, key in enumerate(STAT_KEYS):
+        out[start + offset] = base_stats[key] / STAT_SCALE
@@ -0,0 +1,280 @@
+import inspect
+import os
+import queue
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from battle_encoder import OBSERVATION_SIZE, BattleEncoder
+
+MOVE_ACTIONS = 4
+NO_ACTION = -1
+TAG_WIDTH = 48
+
+# One decision of one player; action uses RLPlayer's encoding (0-3 move, 4-9 switch)
+TURN_DTYPE = np.dtype([
+    ('battle', f'S{TAG_WIDTH}'),
+    ('turn', np.int32),
+    ('player', f'S{TAG_WIDTH}'),
+    ('species', np.int32, (2,)),       # own active, opponent active
+    ('hp', np.float32, (2,)),          # own active, opponent active HP fraction
+    ('action', np.int16),
+    ('observation', np.float32, (OBSERVATION_SIZE,)),
+])
+OUTCOME_DTYPE = np.dtype([
+    ('battle', f'S{TAG_WIDTH}'),
+    ('player', f'S{TAG_WIDTH}'),
+    ('won', np.int8),                  # 1 won, 0 lost, -1 unknown
+    ('turns', np.int32),
+])
+STREAMS = {'turns': TURN_DTYPE, 'outcomes': OUTCOME_DTYPE}
+
+
+class TraceRecorder:
+    """
+    Per-turn battle records in fixed-width chunk files, written by a background thread.
+
+    wrap(player) routes a Player's choose_move through the recorder: every
+    decision appends one TURN_DTYPE record (with the battle_encoder
+    observation written straight into the record) to an in-memory chunk of
+    chunk_size rows. Full chunks are handed to a writer thread and saved as
+    turns-NNNNNN.npy (memory-mappable) or, with compress=True, .npz. Battle
+    results go to outcomes-NNNNNN files the same way. Call close() (or use
+    the recorder as a context manager) to flush the last partial chunks.
+    """
+
+    def __init__(self, directory, chunk_size=4096, compress=False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.encoder = BattleEncoder()
+
+        self._lock = threading.Lock()
+        self._buffers = {name: np.zeros(chunk_size, dtype=dtype) for name, dtype in STREAMS.items()}
+        self._fill = dict.fromkeys(STREAMS, 0)
+        self._sequence = {name: _next_sequence(self.directory, name) for name in STREAMS}
+        self._queue = queue.Queue()
+        self._error = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def wrap(self, player):
+        """Record every choose_move of this Player instance (sync or async) and its results"""
+        choose_move = player.choose_move
+        name = player.username if hasattr(player, 'username') else type(player).__name__
+
+        def recorded_choose_move(battle):
+            order = choose_move(battle)
+            if inspect.isawaitable(order):
+                return self._record_later(name, battle, order)
+            self.record(name, battle, order)
+            return order
+
+        player.choose_move = recorded_choose_move
+
+        finished_callback = getattr(player, '_battle_finished_callback', None)
+        if finished_callback is not None:
+            def recorded_finish(battle):
+                self.record_outcome(name, battle)
+                return finished_callback(battle)
+            player._battle_finished_callback = recorded_finish
+        return player
+
+    async def _record_later(self, name, battle, pending):
+        order = await pending
+        self.record(name, battle, order)
+        return order
+
+    def record(self, player, battle, order):
+        """Append one decision; order is what choose_move returned"""
+        with self._lock:
+            row = self._next_row('turns')
+            row['battle'] = _tag(battle.battle_tag)
+            row['turn'] = battle.turn
+            row['player'] = _tag(player)
+            active, opponent = battle.active_pokemon, battle.opponent_active_pokemon
+            row['species'] = (species_id(active), species_id(opponent))
+            row['hp'] = (active.current_hp_fraction if active else 0.0,
+                         opponent.current_hp_fraction if opponent else 0.0)
+            row['action'] = action_id(order, battle)
+            self.encoder.encode(battle, row['observation'])
+            self._commit('turns')
+
+    def record_outcome(self, player, battle):
+        """Append a finished battle's result (called by wrapped poke_env players)"""
+        with self._lock:
+            row = self._next_row('outcomes')
+            row['battle'] = _tag(battle.battle_tag)
+            row['player'] = _tag(player)
+            row['won'] = -1 if battle.won is None else int(battle.won)
+            row['turns'] = battle.turn
+            self._commit('outcomes')
+
+    def record_engine_results(self, engine, player_1, player_2):
+        """Outcomes of every battle of an OfflineBattleEngine run, for both sides"""
+        for battle in range(engine.done.size):
+            for side, player in enumerate((player_1, player_2)):
+                name = player.username if hasattr(player, 'username') else type(player).__name__
+                self.record_outcome(name, engine.battle(battle, side))
+
+    def _next_row(self, stream):
+        return self._buffers[stream][self._fill[stream]]
+
+    def _commit(self, stream):
+        self._fill[stream] += 1
+        if self._fill[stream] == self.chunk_size:
+            self._hand_off(stream)
+
+    def _hand_off(self, stream):
+        """Queue the filled part of a stream's buffer and start a fresh one"""
+        if self._fill[stream] == 0:
+            return
+        chunk = self._buffers[stream][:self._fill[stream]]
+        path = self.directory / f"{stream}-{self._sequence[stream]:06d}"
+        self._queue.put((path, chunk))
+        self._sequence[stream] += 1
+        self._buffers[stream] = np.zeros(self.chunk_size, dtype=STREAMS[stream])
+        self._fill[stream] = 0
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, chunk = item
+            try:
+                _write_chunk(path, chunk, self.compress)
+            except Exception as error:  # surfaced by flush()/close()
+                self._error = error
+
+    def flush(self):
+        """Hand off partial chunks and wait until everything queued is on disk"""
+        with self._lock:
+            for stream in STREAMS:
+                self._hand_off(stream)
+        done = threading.Event()
+        self._queue.put((None, done))
+        self._wait(done)
+        if self._error is not None:
+            raise self._error
+
+    def _wait(self, done):
+        # The writer treats a (None, Event) item as a barrier
+        while not done.wait(0.05):
+            if not self._writer.is_alive():
+                break
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """
+    Stream TraceRecorder chunk files back as structured NumPy batches.
+
+    .npy chunks are memory-mapped and .npz chunks are decompressed one at a
+    time, so at most one chunk is resident regardless of the trace size.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def chunks(self, stream='turns'):
+        return sorted(path for path in self.directory.glob(f"{stream}-*.np[yz]"))
+
+    def __len__(self):
+        return sum(len(_read_chunk(path)) for path in self.chunks('turns'))
+
+    def iter_batches(self, batch_size=4096, fields=None, stream='turns'):
+        """Yield structured arrays (or the given fields) of up to batch_size records"""
+        for path in self.chunks(stream):
+            chunk = _read_chunk(path)
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk[start:start + batch_size]
+                yield batch if fields is None else {field: np.asarray(batch[field]) for field in fields}
+
+    def outcomes(self):
+        """(battle tag, player) -> won (1 / 0 / -1)"""
+        results = {}
+        for batch in self.iter_batches(stream='outcomes'):
+            for battle, player, won in zip(batch['battle'], batch['player'], batch['won']):
+                results[(battle.decode(), player.decode())] = int(won)
+        return results
+
+    def value_counts(self, field, column=None, batch_size=65536):
+        """Streaming counts of a field (e.g. 'action', or 'species' column 0)"""
+        counts = {}
+        for batch in self.iter_batches(batch_size, fields=[field]):
+            values = batch[field] if column is None else batch[field][:, column]
+            unique, n = np.unique(values, return_counts=True)
+            for value, count in zip(unique.tolist(), n.tolist()):
+                counts[value] = counts.get(value, 0) + count
+        return counts
+
+
+def species_id(pokemon):
+    """Numeric species id: the simulator's own id, else the Pokédex number, else a name hash"""
+    if pokemon is None:
+        return -1
+    for attribute in ('species_id', 'pokedex_num'):
+        value = getattr(pokemon, attribute, None)
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+    return zlib.crc32(str(pokemon.species).encode()) & 0x7FFFFFFF
+
+
+def action_id(order, battle):
+    """RLPlayer action index of an order (0-3 move, 4-9 switch), -1 if not recognisable"""
+    chosen = getattr(order, 'order', order)
+    if chosen is None:
+        return NO_ACTION
+    for index, move in enumerate(battle.available_moves[:MOVE_ACTIONS]):
+        if move is chosen:
+            return index
+    for index, pokemon in enumerate(battle.available_switches):
+        if pokemon is chosen:
+            return MOVE_ACTIONS + index
+    return NO_ACTION
+
+
+def _tag(text):
+    return str(text).encode()[:TAG_WIDTH]
+
+
+def _next_sequence(directory, stream):
+    """Continue numbering after chunks already in the directory"""
+    existing = [int(path.name.split('-')[1].split('.')[0])
+                for path in directory.glob(f"{stream}-*.np[yz]")]
+    return max(existing) + 1 if existing else 0
+
+
+def _write_chunk(path, chunk, compress):
+    if path is None:
+        chunk.set()     # flush barrier
+        return
+    suffix = '.npz' if compress else '.npy'
+    # Dot-prefixed so a half-written chunk never matches the "<stream>-*" globs
+    scratch = path.with_name(f".{path.name}{suffix}")
+    if compress:
+        np.savez_compressed(scratch, records=chunk)
+    else:
+        np.save(scratch, chunk)
+    os.replace(scratch, path.with_suffix(suffix))
+
+
+def _read_chunk(path):
+    if path.suffix == '.npz':
+        with np.load(path) as archive:
+            return archive['records']
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,177 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from battle_log import load_combats
+from systemic_entropy import SystemicEntropyModel
+
+METRICS = ('H', 'VCI', 'B')
+# Resampled index matrices (plus their bincount keys) per replicate block
+BOOTSTRAP_CHUNK_BYTES = 64 * 2 ** 20
+# Lower bound on Var[after win rates], so a replicate whose after period has
+# identical win rates gives a large but finite VCI instead of np.inf
+VARIANCE_FLOOR = 1e-6
+
+Interval = namedtuple('Interval', ['estimate', 'low', 'high', 'bias'])
+INTERVAL_METHODS = ('basic', 'percentile')
+
+
+class MetaBootstrap:
+    """
+    Bootstrap confidence intervals for H(p*), VCI and B from a match log.
+
+    The log (first, second, winner ids per match, combats.csv style) is split
+    into a before and an after period: the first `split` share of rows, or a
+    boolean mask marking the after rows. Following StreamingEntropyEstimator,
+    p* is the usage share of every strategy in the after period, viabilities
+    are per-strategy win rates, VCI = Var[before] / Var[after] and B combines
+    both with the counterplay index.
+
+    Each period is resampled with replacement on its own. A block of r
+    replicates is one (r, matches) index matrix per period; usage and win
+    counts for the whole block come from bincounts over
+    replicate-offset strategy ids, and the metrics from the batched
+    SystemicEntropyModel functions. Blocks are sized to about
+    BOOTSTRAP_CHUNK_BYTES and draw from their own SeedSequence streams, so
+    results do not depend on n_workers.
+    """
+
+    def __init__(self, first, second, winner, split=0.5, n_strategies=None, id_offset=1,
+                 counterplay_index=1.0, alpha=0.4, beta=0.4, gamma=0.2,
+                 variance_floor=VARIANCE_FLOOR):
+        first = np.asarray(first, dtype=np.int64) - id_offset
+        second = np.asarray(second, dtype=np.int64) - id_offset
+        winner = np.asarray(winner, dtype=np.int64) - id_offset
+        if n_strategies is None:
+            n_strategies = int(max(first.max(), second.max())) + 1
+        self.n_strategies = n_strategies
+
+        if np.ndim(split) == 0:
+            after = np.arange(first.size) >= int(round(split * first.size))
+        else:
+            after = np.asarray(split, dtype=bool)
+        if after.all() or not after.any():
+            raise ValueError("both periods need at least one match")
+        # Per period: (matches, 2) participants and the (matches,) winners
+        self.periods = tuple((np.column_stack([first[mask], second[mask]]).astype(np.int32),
+                              winner[mask].astype(np.int32))
+                             for mask in (~after, after))
+
+        self.counterplay_index = counterplay_index
+        self.weights = (alpha, beta, gamma)
+        self.variance_floor = variance_floor
+
+    @classmethod
+    def from_combats(cls, cache_dir=None, **kwargs):
+        """Bootstrap over data/pokemon_battle/combats.csv"""
+        log = load_combats(cache_dir)
+        return cls(log['First_pokemon'], log['Second_pokemon'], log['Winner'], **kwargs)
+
+    def point_estimate(self):
+        """Metrics of the observed log, {'H', 'VCI', 'B'} -> float"""
+        identity = tuple(np.arange(len(winners), dtype=np.int32)[None, :]
+                         for _, winners in self.periods)
+        metrics = _block_metrics(self._settings(), identity)
+        return {name: float(values[0]) for name, values in zip(METRICS, metrics)}
+
+    def replicates(self, n_replicates=2000, seed=None, n_workers=None, block_size=None):
+        """{'H', 'VCI', 'B'} -> (n_replicates,) bootstrap draws"""
+        if block_size is None:
+            n_matches = sum(len(winners) for _, winners in self.periods)
+            # int32 indices plus three int64 key arrays per resampled match
+            block_size = max(1, BOOTSTRAP_CHUNK_BYTES // (28 * n_matches))
+        if n_workers is not None and n_workers > 1:
+            block_size = min(block_size, -(-n_replicates // n_workers))
+        blocks = [slice(start, min(start + block_size, n_replicates))
+                  for start in range(0, n_replicates, block_size)]
+        streams = np.random.SeedSequence(seed).spawn(len(blocks))
+        jobs = [(self._settings(), block.stop - block.start, stream)
+                for block, stream in zip(blocks, streams)]
+
+        results = {name: np.empty(n_replicates) for name in METRICS}
+        if n_workers is None or n_workers <= 1 or len(blocks) == 1:
+            outputs = [_bootstrap_block(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                outputs = list(pool.map(_bootstrap_block, *zip(*jobs)))
+        for block, metrics in zip(blocks, outputs):
+            for name, values in zip(METRICS, metrics):
+                results[name][block] = values
+        return results
+
+    def confidence_intervals(self, n_replicates=2000, level=0.95, seed=None, n_workers=None,
+                             block_size=None, method='percentile'):
+        """
+        {'H', 'VCI', 'B'} -> Interval(estimate, low, high, bias).
+
+        method='percentile' returns the draw quantiles [q_low, q_high].
+        Plug-in entropy is biased downwards, so its draws sit below the
+        estimate; bias (mean draw minus estimate) reports that shift next to
+        every interval. method='basic' reflects the quantiles around the
+        estimate, [2·estimate - q_high, 2·estimate - q_low], which moves the
+        interval by the bias instead; when the bias outweighs the sampling
+        spread (H on a large log) that excludes the plug-in estimate.
+        """
+        if method not in INTERVAL_METHODS:
+            raise ValueError(f"Unknown interval method: {method}")
+        draws = self.replicates(n_replicates, seed, n_workers, block_size)
+        estimate = self.point_estimate()
+        tail = 100 * (1 - level) / 2
+        intervals = {}
+        for name in METRICS:
+            # 'lower'/'higher' keep infinite VCI draws from interpolating to nan
+            q_low = float(np.nanpercentile(draws[name], tail, method='lower'))
+            q_high = float(np.nanpercentile(draws[name], 100 - tail, method='higher'))
+            with np.errstate(invalid='ignore'):
+                bias = float(np.nanmean(draws[name]) - estimate[name])
+                if method == 'basic':
+                    q_low, q_high = 2 * estimate[name] - q_high, 2 * estimate[name] - q_low
+            intervals[name] = Interval(estimate[name], q_low, q_high, bias)
+        return intervals
+
+    def _settings(self):
+        return (self.periods, self.n_strategies, self.counterplay_index, self.weights,
+                self.variance_floor)
+
+
+def _bootstrap_block(settings, n_replicates, stream):
+    """Worker for MetaBootstrap: metrics of one block of resampled replicates"""
+    rng = np.random.default_rng(stream)
+    periods = settings[0]
+    indices = tuple(rng.integers(0, len(winners), size=(n_replicates, len(winners)),
+                                 dtype=np.int32)
+                    for _, winners in periods)
+    return _block_metrics(settings, indices)
+
+
+def _block_metrics(settings, indices):
+    """H, VCI and B for replicates given as one (r, matches) index matrix per period"""
+    periods, n_strategies, counterplay_index, (alpha, beta, gamma), variance_floor = settings
+    usages, viabilities = [], []
+    for (players, winners), index in zip(periods, indices):
+        usage, wins = _replicate_counts(players, winners, index, n_strategies)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            viabilities.append(np.where(usage > 0, wins / usage, np.nan))
+        usages.append(usage)
+
+    model = SystemicEntropyModel()
+    usage_after = usages[1]
+    H = model.calculate_strategic_entropy_batch(usage_after / usage_after.sum(axis=1, keepdims=True))
+    VCI = model.calculate_viability_compression_index_batch(
+        *viabilities, variance_floor=variance_floor)
+    B = model.calculate_boringness_metric_batch(
+        H, VCI, counterplay_index, alpha=alpha, beta=beta, gamma=gamma)
+    return H, VCI, B
+
+
+def _replicate_counts(players, winners, index, n_strategies):
+    """(r, strategies) usage and win counts of resampled matches"""
+    n_replicates = index.shape[0]
+    offsets = (np.arange(n_replicates, dtype=np.int64) * n_strategies)[:, None]
+    size = n_replicates * n_strategies
+    usage = (np.bincount((players[index, 0] + offsets).ravel(), minlength=size)
+             + np.bincount((players[index, 1] + offsets).ravel(), minlength=size))
+    wins = np.bincount((winners[index] + offsets).ravel(), minlength=size)
+    return (usage.reshape(n_replicates, n_strategies).astype(np.float64),
+            wins.reshape(n_replicates, n_strategies).astype(np.float64))
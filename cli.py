@@ -0,0 +1,188 @@
+"""
+Command line entry point: tournament, train, analyze, bootstrap, lol and simulate.
+
+Only argparse is imported up front; each command imports what it needs when
+it runs, so `python cli.py --help` stays fast.
+"""
+import argparse
+import sys
+
+BOT_NAMES = ("Random", "MaxDamage", "Smart")
+
+
+def tournament(args):
+    from battle_setup import run_tournament
+
+    run_tournament(n_battles=args.battles, max_concurrent_battles=args.max_concurrent,
+                   n_workers=args.workers, showdown_path=args.showdown_path,
+                   results_path=args.results)
+
+
+def train(args):
+    from rl_training import train_vectorized
+
+    _, throughput = train_vectorized(
+        total_timesteps=args.timesteps, n_envs=args.envs, opponent_pool=args.opponents,
+        subprocess=not args.no_subprocess, checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every, seed=args.seed)
+    if throughput.history:
+        rates = [rate for _, rate in throughput.history]
+        print(f"Mean throughput: {sum(rates) / len(rates):.0f} steps/s")
+
+
+def analyze(args):
+    import numpy as np
+
+    from feature_pipeline import load_features
+    from matchup_matrix import MatchupMatrix
+    from mixed_associations import AssociationEngine
+    from systemic_entropy import SystemicEntropyModel
+
+    df = load_features(rebuild=args.rebuild)
+    columns = [column for column in df.columns if column not in ('number', 'name', 'abilities')]
+    associations = AssociationEngine(df[columns], n_jobs=args.jobs).compute()
+    values = associations.values.copy()
+    values[np.tril_indices_from(values)] = np.nan
+    order = np.argsort(-np.nan_to_num(np.abs(values), nan=-1.0), axis=None)[:args.top]
+    print(f"Strongest associations among {len(columns)} Pokémon features:")
+    for flat in order:
+        i, j = np.unravel_index(flat, values.shape)
+        print(f"  {columns[i]} ~ {columns[j]}: {values[i, j]:.3f}")
+
+    matchups = MatchupMatrix.from_combats()
+    p = matchups.solve_equilibrium()
+    print(f"Combats equilibrium: {int((p > 1e-9).sum())} strategies in support, "
+          f"H(p*) = {SystemicEntropyModel().calculate_strategic_entropy(p):.3f}")
+
+
+def bootstrap(args):
+    import numpy as np
+
+    from bootstrap import MetaBootstrap
+
+    model = MetaBootstrap.from_combats(split=args.split, variance_floor=args.variance_floor)
+    intervals = model.confidence_intervals(args.replicates, level=args.level, seed=args.seed,
+                                           n_workers=args.workers, method=args.method)
+    print(f"{args.level:.0%} {args.method} bootstrap intervals over {args.replicates} replicates:")
+    for name, interval in intervals.items():
+        if not np.isfinite(interval[:3]).all():
+            print(f"  {name}: unbounded (estimate {interval.estimate:.4f}, interval "
+                  f"[{interval.low:.4f}, {interval.high:.4f}]); after-period win rates "
+                  f"have zero variance, raise --variance-floor")
+            continue
+        print(f"  {name}: {interval.estimate:.4f} [{interval.low:.4f}, {interval.high:.4f}]"
+              f" (bootstrap bias {interval.bias:+.4f})")
+
+
+def lol(args):
+    from lol_data import GAMES_CSV, DraftAggregator
+
+    draft = DraftAggregator.from_csv(args.games or GAMES_CSV, chunksize=args.chunksize)
+    champions = draft.champions
+    print(f"{draft.games} games, {int((draft.picks > 0).sum())} of {len(champions)} champions picked")
+    print(f"Pick entropy H = {draft.entropy():.3f}, role entropy = {draft.role_entropy():.3f}")
+    for row in draft.pick_rates().argsort()[::-1][:args.top]:
+        print(f"  {champions.names[row]}: pick {draft.pick_rates()[row]:.1%}, "
+              f"ban {draft.ban_rates()[row]:.1%}, win {draft.win_rates()[row]:.1%}")
+    matchups = draft.matchups()
+    p = matchups.solve_equilibrium()
+    print(f"Champion equilibrium: {int((p > 1e-9).sum())} in support, "
+          f"H(p*) = {draft.entropy_model.calculate_strategic_entropy(p):.3f}")
+
+
+def simulate(args):
+    if args.kind == 'battles':
+        from league import HEURISTIC_BOTS
+        from offline_battle import OfflineBattleEngine
+
+        engine = OfflineBattleEngine(seed=args.seed)
+        players = [HEURISTIC_BOTS[name](start_listening=False) for name in (args.player_1, args.player_2)]
+        result = engine.play(*players, n_battles=args.battles)
+        print(f"{args.player_1} {result.wins[0]} - {result.wins[1]} {args.player_2} "
+              f"(mean {result.turns.mean():.1f} turns)")
+    else:
+        from variance_compression import CompressionEnsemble
+
+        ensemble = CompressionEnsemble.grid(args.walls, args.pruning_rates,
+                                            noise_scale=args.noise, seed=args.seed)
+        means, variances = ensemble.simulate(args.initial_mean, args.initial_variance,
+                                             args.steps, n_runs=args.runs, n_workers=args.workers)
+        final = variances[:, :, -1].mean(axis=1)
+        for wall, rate, variance in zip(ensemble.right_walls, ensemble.pruning_rates, final):
+            print(f"wall={wall:g} pruning={rate:g}: final variance {variance:.4g}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('tournament', help="Round robin between the bots on Showdown servers")
+    p.add_argument('--battles', type=int, default=100)
+    p.add_argument('--max-concurrent', type=int, default=20)
+    p.add_argument('--workers', type=int, default=1, help="Showdown server shards")
+    p.add_argument('--showdown-path', help="pokemon-showdown checkout to start per shard")
+    p.add_argument('--results', help="CSV to stream match results to")
+    p.set_defaults(func=tournament)
+
+    p = commands.add_parser('train', help="Train the RL player with PPO on offline battles")
+    p.add_argument('--timesteps', type=int, default=10000)
+    p.add_argument('--envs', type=int, default=4)
+    p.add_argument('--opponents', nargs='+', default=['random', 'max_damage', 'smart'])
+    p.add_argument('--no-subprocess', action='store_true', help="Run environments in-process")
+    p.add_argument('--checkpoint-dir', default='checkpoints')
+    p.add_argument('--checkpoint-every', type=int, default=50000)
+    p.add_argument('--seed', type=int)
+    p.set_defaults(func=train)
+
+    p = commands.add_parser('analyze', help="Feature associations and the combats equilibrium")
+    p.add_argument('--top', type=int, default=15)
+    p.add_argument('--jobs', type=int, default=1)
+    p.add_argument('--rebuild', action='store_true', help="Ignore the feature cache")
+    p.set_defaults(func=analyze)
+
+    p = commands.add_parser('bootstrap', help="Confidence intervals for H, VCI and B on combats")
+    p.add_argument('--replicates', type=int, default=2000)
+    p.add_argument('--level', type=float, default=0.95)
+    p.add_argument('--method', choices=('percentile', 'basic'), default='percentile',
+                   help="basic shifts the interval by the bootstrap bias")
+    p.add_argument('--split', type=float, default=0.5, help="Share of matches in the before period")
+    p.add_argument('--variance-floor', type=float, default=1e-6,
+                   help="Lower bound on Var[after win rates]; 0 lets VCI become infinite")
+    p.add_argument('--workers', type=int)
+    p.add_argument('--seed', type=int)
+    p.set_defaults(func=bootstrap)
+
+    p = commands.add_parser('lol', help="League of Legends pick / ban / win summary")
+    p.add_argument('games', nargs='?', help="Ranked games CSV (default data/league_of_legends_match/games.csv)")
+    p.add_argument('--chunksize', type=int, default=100_000)
+    p.add_argument('--top', type=int, default=10)
+    p.set_defaults(func=lol)
+
+    p = commands.add_parser('simulate', help="Offline battles or variance compression runs")
+    kinds = p.add_subparsers(dest='kind', required=True)
+    battles = kinds.add_parser('battles', help="Bot vs bot on the offline battle engine")
+    battles.add_argument('player_1', choices=BOT_NAMES)
+    battles.add_argument('player_2', choices=BOT_NAMES)
+    battles.add_argument('--battles', type=int, default=500)
+    battles.add_argument('--seed', type=int)
+    compression = kinds.add_parser('compression', help="Variance compression ensemble grid")
+    compression.add_argument('--walls', type=float, nargs='+', default=[10.0])
+    compression.add_argument('--pruning-rates', type=float, nargs='+', default=[0.1])
+    compression.add_argument('--initial-mean', type=float, default=0.0)
+    compression.add_argument('--initial-variance', type=float, default=1.0)
+    compression.add_argument('--steps', type=int, default=1000)
+    compression.add_argument('--runs', type=int, default=1)
+    compression.add_argument('--noise', type=float, default=0.0)
+    compression.add_argument('--workers', type=int)
+    compression.add_argument('--seed', type=int)
+    p.set_defaults(func=simulate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
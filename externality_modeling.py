@@ -1,26 +1,225 @@
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from intervention_scheduler import InterventionScheduler
+from matchup_matrix import batched_equilibrium
+from systemic_entropy import SystemicEntropyModel
+
+INTERVENTION_TYPES = ("threshold_shift", "new_mechanic", "environmental_change")
+# Payoff stack size per evaluation chunk when chunk_size is not given
+SCENARIO_CHUNK_BYTES = 128 * 2 ** 20
+
+# A batch of candidate balance patches; any field may be None (not applied)
+#   threshold_scale (scenarios,)              multiplies the viability threshold
+#   role_bonus      (scenarios, n)            new-mechanic bonus b; payoff_ij += b_i - b_j
+#   perturbation    (scenarios, n, n)         environmental shift, antisymmetrized
+Scenarios = namedtuple('Scenarios', ['threshold_scale', 'role_bonus', 'perturbation'])
+ScenarioResult = namedtuple(
+    'ScenarioResult',
+    ['equilibria', 'entropy', 'exploitability', 'converged', 'viabilities', 'viable'])
+
+
 class InterventionModel:
+    """
+    Batched balance-patch evaluation on a symmetric zero-sum payoff matrix.
+
+    A batch of Scenarios is applied as stacked array operations (threshold
+    masks over viabilities, role bonuses b_i - b_j and antisymmetric payoff
+    perturbations, so every patched game stays zero-sum), then the
+    equilibrium p* of every scenario is found in one lockstep batched solve
+    and scored by H(p*). Scenarios are processed in chunks (by default about
+    SCENARIO_CHUNK_BYTES of payoffs each) to bound memory on large pools.
+
+    Viabilities default to each strategy's expected win rate against a
+    uniform field, (1 + mean_j payoff_ij) / 2; given viabilities (e.g.
+    observed win rates) are shifted by the same quantity when a patch
+    changes the payoffs.
+
+    Scenarios whose solve does not reach tol within the iteration budget are
+    flagged in ScenarioResult.converged, trigger a RuntimeWarning and rank
+    after every converged one.
+    """
+
+    def __init__(self, payoff_matrix=None, viabilities=None, viability_threshold=0.5,
+                 method='hedge', iterations=2000, tol=1e-3, chunk_size=None, seed=None):
+        self.payoff_matrix = None if payoff_matrix is None else np.asarray(payoff_matrix, dtype=np.float64)
+        self.viabilities = None if viabilities is None else np.asarray(viabilities, dtype=np.float64)
+        self.viability_threshold = viability_threshold
+        self.method = method
+        self.iterations = iterations
+        self.tol = tol
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self.entropy_model = SystemicEntropyModel()
+
+    @classmethod
+    def from_matchups(cls, matchups, **kwargs):
+        """Dense model over the observed strategies of a MatchupMatrix"""
+        index = np.flatnonzero(matchups.observed)
+        payoff = matchups.payoff[index][:, index].toarray()
+        return cls(payoff, viabilities=matchups.win_rates()[index], **kwargs)
+
+    @property
+    def n_strategies(self):
+        return self.payoff_matrix.shape[0]
+
+    @staticmethod
+    def field_viabilities(payoffs):
+        """Expected win rate of every strategy against a uniform field"""
+        return (1.0 + np.asarray(payoffs).mean(axis=-1)) / 2.0
+
+    def scenarios(self, n_scenarios, threshold_scale=None, role_bonus=None, perturbation=None):
+        """Broadcast per-patch arrays (or shared ones) to a batch of n_scenarios"""
+        n = self.n_strategies
+        if threshold_scale is not None:
+            threshold_scale = np.broadcast_to(
+                np.asarray(threshold_scale, dtype=np.float64), (n_scenarios,))
+        if role_bonus is not None:
+            role_bonus = np.broadcast_to(np.asarray(role_bonus, dtype=np.float64), (n_scenarios, n))
+        if perturbation is not None:
+            perturbation = np.broadcast_to(
+                np.asarray(perturbation, dtype=np.float64), (n_scenarios, n, n))
+        return Scenarios(threshold_scale, role_bonus, perturbation)
+
+    def random_scenarios(self, n_scenarios, threshold_range=(0.6, 1.0), role_scale=0.1,
+                         perturbation_scale=0.1):
+        """Random candidate patches mixing all three intervention types"""
+        n = self.n_strategies
+        threshold_scale = self.rng.uniform(*threshold_range, size=n_scenarios)
+        role_bonus = role_scale * self.rng.standard_normal((n_scenarios, n)) if role_scale else None
+        perturbation = (perturbation_scale * self.rng.standard_normal((n_scenarios, n, n))
+                        if perturbation_scale else None)
+        return Scenarios(threshold_scale, role_bonus, perturbation)
+
+    def apply(self, scenarios, start=0, stop=None):
+        """Patched payoffs (s, n, n), viabilities (s, n) and viable masks (s, n)"""
+        size = _scenario_count(scenarios)
+        stop = size if stop is None else min(stop, size)
+        count = stop - start
+        payoffs = np.broadcast_to(self.payoff_matrix, (count,) + self.payoff_matrix.shape).copy()
+
+        if scenarios.role_bonus is not None:
+            bonus = scenarios.role_bonus[start:stop]
+            payoffs += bonus[:, :, None] - bonus[:, None, :]
+        if scenarios.perturbation is not None:
+            shift = scenarios.perturbation[start:stop]
+            payoffs += (shift - shift.transpose(0, 2, 1)) / 2
+
+        field = self.field_viabilities(payoffs)
+        if self.viabilities is None:
+            viabilities = field
+        else:
+            viabilities = self.viabilities + (field - self.field_viabilities(self.payoff_matrix))
+
+        threshold = np.full(count, float(self.viability_threshold))
+        if scenarios.threshold_scale is not None:
+            threshold = threshold * scenarios.threshold_scale[start:stop]
+        viable = viabilities >= threshold[:, None]
+        return payoffs, viabilities, viable
+
+    def evaluate(self, scenarios):
+        """Equilibrium, H(p*), exploitability, converged, viabilities and viable masks per scenario"""
+        size = _scenario_count(scenarios)
+        chunk = self.chunk_size or max(1, SCENARIO_CHUNK_BYTES // (8 * self.n_strategies ** 2))
+        parts = []
+        for start in range(0, size, chunk):
+            payoffs, viabilities, viable = self.apply(scenarios, start, start + chunk)
+            equilibria, exploitability, converged = batched_equilibrium(
+                payoffs, viable, iterations=self.iterations, method=self.method, tol=self.tol)
+            entropy = self.entropy_model.calculate_strategic_entropy_batch(equilibria)
+            parts.append((equilibria, entropy, exploitability, converged, viabilities, viable))
+        result = ScenarioResult(*(np.concatenate(field) for field in zip(*parts)))
+        self._warn_unconverged(~result.converged)
+        return result
+
+    def rank(self, scenarios, top=10):
+        """(scenario indices by descending H(p*), converged scenarios first; the ScenarioResult)"""
+        result = self.evaluate(scenarios)
+        order = np.lexsort((-result.entropy, ~result.converged))
+        return order[:top], result
+
     def simulate_rule_change_impact(self, system_state, intervention_type):
-        """Model how external changes reset variance compression"""
-        
+        """Model how external changes reset variance compression
+
+        Returns a new state dict (the input is not modified) with the patched
+        fields plus the resulting 'equilibrium', 'equilibrium_converged' and
+        'strategic_entropy'.
+        """
+        state = dict(system_state)
+        state['payoff_matrix'] = np.asarray(state['payoff_matrix'], dtype=np.float64)
+        state.setdefault('viability_threshold', self.viability_threshold)
+
         if intervention_type == "threshold_shift":
             # Change what constitutes "viable" strategy
-            system_state['viability_threshold'] *= 0.8
-            system_state['strategy_viabilities'] = self.recalculate_viabilities(system_state)
-            
+            state['viability_threshold'] *= 0.8
+            state['strategy_viabilities'] = self.recalculate_viabilities(state)
+
         elif intervention_type == "new_mechanic":
             # Add complexity that advantages different strategies
-            system_state['role_requirements'] = self.add_new_roles(system_state)
-            
+            state['role_requirements'] = self.add_new_roles(state)
+            bonus = state['role_requirements']
+            state['payoff_matrix'] = state['payoff_matrix'] + bonus[:, None] - bonus[None, :]
+
         elif intervention_type == "environmental_change":
             # Shift the basis of competition entirely
-            system_state['payoff_matrix'] = self.modify_payoff_structure(system_state)
-            
-        return system_state
-    
-    def optimize_intervention_timing(self, boringness_trajectory):
-        """Find optimal times to intervene to maintain diversity"""
-        intervention_points = []
-        for i in range(len(boringness_trajectory)):
-            if boringness_trajectory[i] > 0.6:  # Before critical threshold
-                intervention_points.append(i)
-        return intervention_points
+            state['payoff_matrix'] = self.modify_payoff_structure(state)
+
+        else:
+            raise ValueError(f"Unknown intervention type: {intervention_type}")
+
+        payoff = state['payoff_matrix']
+        viabilities = self.field_viabilities(payoff)
+        viable = viabilities >= state['viability_threshold']
+        equilibria, _, converged = batched_equilibrium(
+            payoff[None], viable[None], iterations=self.iterations, method=self.method, tol=self.tol)
+        self._warn_unconverged(~converged)
+        state['equilibrium'] = equilibria[0]
+        state['equilibrium_converged'] = bool(converged[0])
+        state['strategic_entropy'] = float(self.entropy_model.calculate_strategic_entropy(equilibria[0]))
+        return state
+
+    def _warn_unconverged(self, unconverged):
+        if unconverged.any():
+            warnings.warn(f"{int(unconverged.sum())} of {unconverged.size} equilibria did not reach "
+                          f"tol {self.tol:g} within {self.iterations} iterations",
+                          RuntimeWarning, stacklevel=3)
+
+    def recalculate_viabilities(self, system_state):
+        """Field viabilities, zeroed for strategies under the viability threshold"""
+        viabilities = self.field_viabilities(system_state['payoff_matrix'])
+        return np.where(viabilities >= system_state['viability_threshold'], viabilities, 0.0)
+
+    def add_new_roles(self, system_state, strength=0.1):
+        """Role bonus for strategies below the median viability (the ones a new mechanic helps)"""
+        viabilities = self.field_viabilities(system_state['payoff_matrix'])
+        return strength * np.maximum(np.median(viabilities) - viabilities, 0.0) \
+            / max(np.ptp(viabilities), 1e-12)
+
+    def modify_payoff_structure(self, system_state, scale=0.1):
+        """Payoff matrix plus a random antisymmetric shift"""
+        payoff = system_state['payoff_matrix']
+        shift = scale * self.rng.standard_normal(payoff.shape)
+        return payoff + (shift - shift.T) / 2
+
+    def optimize_intervention_timing(self, boringness_trajectory, cost=1.0, window=10,
+                                     budget=None, threshold=0.6):
+        """Find optimal times to intervene to maintain diversity
+
+        Minimum-cost intervention steps (see InterventionScheduler); the
+        threshold sits before the critical level. A (metas, time) batch
+        returns one list per meta.
+        """
+        scheduler = InterventionScheduler(cost, window, threshold, budget)
+        schedules = scheduler.plan(boringness_trajectory)
+        if isinstance(schedules, list):
+            return [schedule.times.tolist() for schedule in schedules]
+        return schedules.times.tolist()
+
+
+def _scenario_count(scenarios):
+    for field in scenarios:
+        if field is not None:
+            return len(field)
+    raise ValueError("Scenarios has no interventions")
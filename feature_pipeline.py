@@ -0,0 +1,142 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from battle_log import CACHE_DIR, DATA_DIR
+
+ALL_POKEMON_CSV = DATA_DIR / 'pokemon_stat' / 'All_Pokemon.csv'
+
+# Bump when the engineered columns change so old cache files are ignored
+PIPELINE_VERSION = '1'
+
+COLUMN_RENAMES = {
+    'Number': 'number',
+    'Name': 'name',
+    'Type 1': 'type1',
+    'Type 2': 'type2',
+    'HP': 'hp',
+    'Att': 'attack',
+    'Def': 'defense',
+    'Spa': 'sp_attack',
+    'Spd': 'sp_defense',
+    'Spe': 'speed',
+    'BST': 'bst',
+}
+STAT_COLUMNS = ['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed']
+REQUIRED_COLUMNS = ['number', 'name', 'type1', 'type2', *STAT_COLUMNS, 'bst']
+AGAINST_PREFIX = 'against_'
+
+# Cache formats in order of preference; the first one whose writer works is used
+CACHE_FORMATS = (
+    ('.parquet', pd.DataFrame.to_parquet, pd.read_parquet),
+    ('.feather', pd.DataFrame.to_feather, pd.read_feather),
+    ('.pkl', pd.DataFrame.to_pickle, pd.read_pickle),
+)
+
+
+def normalize_columns(df):
+    """All_Pokemon.csv headers to the snake_case names used by the analyses"""
+    return df.rename(columns=lambda column: COLUMN_RENAMES.get(
+        column, column.strip().lower().replace(' ', '_')))
+
+
+def validate_schema(df, required=REQUIRED_COLUMNS):
+    """Raise ValueError if required columns are missing"""
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+
+def validation_report(df, critical_fields=('name', 'bst', 'type1')):
+    """Missing values per critical field and the number of rows whose bst != Σ stats"""
+    fields = [field for field in critical_fields if field in df.columns]
+    missing = df[fields].isnull().sum()
+    bst_mismatch = int((df['bst'] != df[STAT_COLUMNS].sum(axis=1)).sum())
+    return missing, bst_mismatch
+
+
+def engineer_features(df):
+    """Add the derived columns in place (vectorized) and return df"""
+    stats = df[STAT_COLUMNS].to_numpy()
+    df['bst'] = stats.sum(axis=1)
+    df['offensive_stat'] = df[['attack', 'sp_attack']].max(axis=1)
+    df['defensive_stat'] = df[['defense', 'sp_defense']].mean(axis=1)
+    df['is_offensive'] = df['attack'] + df['sp_attack'] > 140
+    df['is_fast'] = df['speed'] > 100
+    df['is_bulky'] = df['hp'] + df['defense'] + df['sp_defense'] > 200
+
+    against = [column for column in df.columns if column.startswith(AGAINST_PREFIX)]
+    if against:
+        quadruple = df[against].to_numpy() >= 4
+        df['weakness_4x_count'] = quadruple.sum(axis=1)
+        df['has_4x_weakness'] = quadruple.any(axis=1)
+    return df
+
+
+def build_features(csv_path=ALL_POKEMON_CSV):
+    """Read, normalize, validate and engineer the Pokémon table (no caching)"""
+    df = normalize_columns(pd.read_csv(csv_path))
+    validate_schema(df)
+    _, bst_mismatch = validation_report(df)
+    if bst_mismatch:
+        raise ValueError(f"{bst_mismatch} rows have a BST that is not the sum of their stats")
+    return engineer_features(df)
+
+
+def content_hash(path):
+    digest = hashlib.sha256(PIPELINE_VERSION.encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def load_features(csv_path=ALL_POKEMON_CSV, cache_dir=None, rebuild=False):
+    """
+    Engineered Pokémon frame, cached under a hash of the CSV's contents.
+
+    The frame is written as Parquet, else Feather, else pickle depending on
+    what is installed; an edited CSV gets a new hash and is rebuilt.
+    """
+    cache_root = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    stem = cache_root / f"{Path(csv_path).stem}-features-{content_hash(csv_path)}"
+
+    if not rebuild:
+        df = read_frame(stem)
+        if df is not None:
+            return df
+
+    df = build_features(csv_path)
+    write_frame(df, stem)
+    return df
+
+
+def write_frame(df, stem):
+    """Write df next to stem in the first available CACHE_FORMATS format; returns the path"""
+    stem = Path(stem)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    for suffix, writer, _ in CACHE_FORMATS:
+        path = stem.with_name(stem.name + suffix)
+        scratch = path.with_name(path.name + f".{os.getpid()}.tmp")
+        try:
+            writer(df, scratch)
+        except ImportError:
+            continue
+        os.replace(scratch, path)
+        return path
+    raise RuntimeError("No DataFrame writer available")
+
+
+def read_frame(stem):
+    """Read a frame written by write_frame, or None if there is none"""
+    stem = Path(stem)
+    for suffix, _, reader in CACHE_FORMATS:
+        path = stem.with_name(stem.name + suffix)
+        if path.exists():
+            try:
+                return reader(path)
+            except ImportError:
+                continue
+    return None
@@ -0,0 +1,166 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Memory budget of the DP tables (levels × trajectories × time) per planning chunk
+PLAN_CHUNK_BYTES = 256 * 2 ** 20
+
+Schedule = namedtuple('Schedule', ['times', 'total_cost', 'uncovered_excess'])
+
+
+class InterventionScheduler:
+    """
+    Minimum-cost intervention times for boringness trajectories.
+
+    Every step whose boringness B_t is above threshold costs its excess
+    B_t - threshold unless an intervention in the last `window` steps reset
+    the meta (an intervention at u covers u .. u + window - 1). Each
+    intervention costs `cost` (a scalar, or one value per step). The plan
+    minimises uncovered excess + intervention costs using at most `budget`
+    interventions.
+
+    The DP runs over intervention levels k = 0..K. For each level it is
+    vectorized across time and across trajectories: one trailing sliding
+    minimum and one cumulative minimum per level, so the total work is
+    O(T·K) per trajectory and there is no Python loop over time. Only a
+    binding budget keeps every level for the backtrack (O(budget·T) memory);
+    otherwise the levels are iterated in place until they stop improving and
+    the plan is read off that fixed point in O(T) memory.
+    """
+
+    def __init__(self, cost=1.0, window=10, threshold=0.6, budget=None):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.cost = cost
+        self.window = int(window)
+        self.threshold = threshold
+        self.budget = budget
+
+    def excess(self, trajectories):
+        return np.maximum(np.asarray(trajectories, dtype=np.float64) - self.threshold, 0.0)
+
+    def useful_levels(self, trajectories):
+        """
+        Most interventions an optimal plan uses: disjoint windows cover every
+        step, and each useful intervention covers an above-threshold step
+        that no other one covers.
+        """
+        n_above = (trajectories > self.threshold).sum(axis=1).max(initial=0)
+        return min(-(-trajectories.shape[1] // self.window), int(n_above))
+
+    def levels(self, trajectories):
+        """Intervention levels the DP runs: the useful ones, capped at the budget"""
+        useful = self.useful_levels(trajectories)
+        return useful if self.budget is None else min(int(self.budget), useful)
+
+    def optimal_cost(self, trajectories):
+        """Minimum total cost per trajectory without building a schedule (O(B·T) memory)"""
+        trajectories = np.atleast_2d(np.asarray(trajectories, dtype=np.float64))
+        E, costs = self._prepare(trajectories)
+        f, _ = self._iterate_levels(E, costs, self.levels(trajectories))
+        return f[:, -1]
+
+    def plan(self, trajectories):
+        """
+        Schedule for a (T,) trajectory, or a list of Schedules for a (B, T) batch.
+
+        Schedule.times are the intervention steps in increasing order.
+        """
+        single = np.ndim(trajectories) == 1
+        trajectories = np.atleast_2d(np.asarray(trajectories, dtype=np.float64))
+        n_batch, n_steps = trajectories.shape
+        K = self.levels(trajectories)
+        binding = K < self.useful_levels(trajectories)
+        per_row = 2 * 8 * ((K + 1) if binding else 2) * (n_steps + 1)
+        chunk = max(1, PLAN_CHUNK_BYTES // per_row)
+
+        schedules = []
+        for start in range(0, n_batch, chunk):
+            rows = trajectories[start:start + chunk]
+            E, costs = self._prepare(rows, start)
+            if binding:
+                f = np.empty((K + 1,) + E.shape)
+                h = np.empty_like(f)
+                f[0] = E
+                h[0] = np.inf
+                for k in range(1, K + 1):
+                    f[k], h[k] = self._next_level(f[k - 1], E, costs)
+            else:
+                # Past the last useful level every level is the fixed point, so
+                # read-only broadcast views stand in for the full tables
+                f, h = self._iterate_levels(E, costs, K)
+                depth = (n_steps + 2,) + E.shape
+                f, h = np.broadcast_to(f, depth), np.broadcast_to(h, depth)
+            for b in range(len(rows)):
+                schedules.append(self._backtrack(f[:, b], h[:, b], E[b], costs[b]))
+        return schedules[0] if single else schedules
+
+    def _iterate_levels(self, E, costs, K):
+        """
+        Level K (f, h) in O(B·T) memory, stopping early once a level no
+        longer improves on the previous one: from there on it is the fixed
+        point, the unlimited-budget optimum.
+        """
+        f = E
+        f_next, h = self._next_level(f, E, costs)
+        for _ in range(K):
+            if np.array_equal(f_next, f):
+                break
+            f = f_next
+            f_next, h = self._next_level(f, E, costs)
+        return f, h
+
+    def _prepare(self, trajectories, start=0):
+        """Prefix sums of excess (B, T + 1) and per-step intervention costs (B, T)"""
+        excess = self.excess(trajectories)
+        E = np.zeros((excess.shape[0], excess.shape[1] + 1))
+        np.cumsum(excess, axis=1, out=E[:, 1:])
+        costs = np.asarray(self.cost, dtype=np.float64)
+        if costs.ndim == 2:
+            costs = costs[start:start + excess.shape[0]]
+        costs = np.broadcast_to(costs, excess.shape)
+        return E, costs
+
+    def _next_level(self, f_prev, E, costs):
+        """
+        f_k[t] = min(f_k[t-1] + e_{t-1}, min_{t-window <= u < t} f_{k-1}[u] + c_u), f_k[0] = 0
+
+        Unrolled: f_k[t] = E[t] + cummin_s(h[s] - E[s]), where h[s] is the best
+        way to end a covered stretch at s (h[0] = 0 is the empty prefix).
+        """
+        start_cost = f_prev[:, :-1] + costs
+        h = np.empty_like(E)
+        h[:, 0] = 0.0
+        h[:, 1:] = _trailing_min(start_cost, self.window)
+        f = E + np.minimum.accumulate(h - E, axis=1)
+        return f, h
+
+    def _backtrack(self, f, h, E, costs):
+        times = []
+        k, t = len(f) - 1, len(E) - 1
+        total = f[k, t]
+        while k > 0 and t > 0:
+            # The last covered stretch ends at s; steps s .. t-1 stay uncovered
+            gaps = (h[k, :t + 1] - E[:t + 1])[::-1]
+            s = t - int(np.argmin(gaps))
+            if s == 0:
+                break
+            lo = max(0, s - self.window)
+            u = lo + int(np.argmin(f[k - 1, lo:s] + costs[lo:s]))
+            times.append(u)
+            k, t = k - 1, u
+        times = np.array(times[::-1], dtype=np.int64)
+        return Schedule(times, float(total), float(total - costs[times].sum()))
+
+
+def _trailing_min(a, window):
+    """m[..., i] = min(a[..., max(0, i - window + 1) : i + 1]) by doubling, O(T log window)"""
+    m = a.copy()
+    span = 1
+    while span < window:
+        step = min(span, window - span)
+        shifted = m.copy()
+        shifted[..., step:] = np.minimum(m[..., step:], m[..., :-step])
+        m = shifted
+        span += step
+    return m
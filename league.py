@@ -0,0 +1,320 @@
+import math
+import sqlite3
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from poke_env.player import RandomPlayer
+
+from heuristic_poke_bot import SmartHeuristicPlayer
+from max_dmg_bot import MaxDamagePlayer
+from offline_battle import OfflineBattleEngine
+from rl_bot import RLPlayer
+from systemic_entropy import SystemicEntropyModel
+
+HEURISTIC_BOTS = {
+    "Random": RandomPlayer,
+    "MaxDamage": MaxDamagePlayer,
+    "Smart": SmartHeuristicPlayer,
+}
+
+ELO_START = 1500.0
+ELO_K = 16.0
+# TrueSkill defaults: mu0 = 25, sigma0 = mu0 / 3, beta = sigma0 / 2, tau = sigma0 / 100
+TS_MU = 25.0
+TS_SIGMA = TS_MU / 3
+TS_BETA = TS_SIGMA / 2
+TS_TAU = TS_SIGMA / 100
+
+Rating = namedtuple('Rating', ['name', 'kind', 'elo', 'mu', 'sigma', 'battles', 'wins'])
+GenerationReport = namedtuple(
+    'GenerationReport', ['generation', 'names', 'distribution', 'viabilities', 'H', 'VCI'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY, kind TEXT, source TEXT,
+    elo REAL, mu REAL, sigma REAL, battles INTEGER, wins INTEGER, added INTEGER);
+CREATE TABLE IF NOT EXISTS matches (
+    generation INTEGER, player_1 TEXT, player_2 TEXT, wins_1 INTEGER, wins_2 INTEGER);
+CREATE TABLE IF NOT EXISTS generations (
+    generation INTEGER, name TEXT, share REAL, viability REAL,
+    PRIMARY KEY (generation, name)) WITHOUT ROWID;
+"""
+
+
+def elo_update(elo_1, elo_2, wins_1, wins_2, k=ELO_K):
+    """Period Elo update for a match of wins_1 + wins_2 battles"""
+    expected_1 = 1.0 / (1.0 + 10 ** ((elo_2 - elo_1) / 400))
+    delta = k * (wins_1 - (wins_1 + wins_2) * expected_1)
+    return elo_1 + delta, elo_2 - delta
+
+
+def trueskill_update(winner, loser, beta=TS_BETA, tau=TS_TAU):
+    """Two-player TrueSkill update without draws; ratings are (mu, sigma)"""
+    (mu_w, sigma_w), (mu_l, sigma_l) = winner, loser
+    var_w, var_l = sigma_w ** 2 + tau ** 2, sigma_l ** 2 + tau ** 2
+    c = math.sqrt(2 * beta ** 2 + var_w + var_l)
+    t = (mu_w - mu_l) / c
+    cdf = 0.5 * math.erfc(-t / math.sqrt(2))
+    v = math.exp(-t * t / 2) / math.sqrt(2 * math.pi) / max(cdf, 1e-12)
+    w = v * (v + t)
+    return ((mu_w + var_w / c * v, math.sqrt(var_w * max(1 - var_w / c ** 2 * w, 1e-6))),
+            (mu_l - var_l / c * v, math.sqrt(var_l * max(1 - var_l / c ** 2 * w, 1e-6))))
+
+
+class RatingStore:
+    """
+    Ratings, match history and per-generation meta snapshots in one sqlite file.
+
+    Each recorded match updates Elo (one period update per match) and
+    TrueSkill (one update per battle, in battle order) in a single
+    transaction, so an interrupted league never leaves half-applied ratings.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def register(self, name, kind, source="", generation=0):
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO players VALUES (?, ?, ?, ?, ?, ?, 0, 0, ?)",
+                (name, kind, str(source), ELO_START, TS_MU, TS_SIGMA, generation))
+
+    def rating(self, name):
+        row = self.db.execute(
+            "SELECT name, kind, elo, mu, sigma, battles, wins FROM players WHERE name = ?",
+            (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return Rating(*row)
+
+    def ratings(self):
+        """All players ordered by Elo, best first"""
+        rows = self.db.execute(
+            "SELECT name, kind, elo, mu, sigma, battles, wins FROM players ORDER BY elo DESC")
+        return [Rating(*row) for row in rows]
+
+    def players(self):
+        """name -> (kind, source) in registration order"""
+        rows = self.db.execute("SELECT name, kind, source FROM players ORDER BY rowid")
+        return {name: (kind, source) for name, kind, source in rows}
+
+    def record(self, generation, name_1, name_2, winners):
+        """Apply one match; winners[i] is 0 if name_1 won battle i, 1 if name_2 did"""
+        winners = np.asarray(winners)
+        wins_2 = int(winners.sum())
+        wins_1 = winners.size - wins_2
+        first, second = self.rating(name_1), self.rating(name_2)
+
+        elo_1, elo_2 = elo_update(first.elo, second.elo, wins_1, wins_2)
+        ts = [(first.mu, first.sigma), (second.mu, second.sigma)]
+        for winner in winners:
+            ts[winner], ts[1 - winner] = trueskill_update(ts[winner], ts[1 - winner])
+
+        with self.db:
+            self.db.execute("INSERT INTO matches VALUES (?, ?, ?, ?, ?)",
+                            (generation, name_1, name_2, wins_1, wins_2))
+            for name, elo, (mu, sigma), wins in ((name_1, elo_1, ts[0], wins_1),
+                                                 (name_2, elo_2, ts[1], wins_2)):
+                self.db.execute(
+                    "UPDATE players SET elo = ?, mu = ?, sigma = ?, battles = battles + ?, "
+                    "wins = wins + ? WHERE name = ?",
+                    (elo, mu, sigma, int(winners.size), wins, name))
+        return wins_1, wins_2
+
+    def generation_results(self, generation):
+        """name -> (wins, battles) over the matches of one generation"""
+        totals = {}
+        rows = self.db.execute(
+            "SELECT player_1, player_2, wins_1, wins_2 FROM matches WHERE generation = ?",
+            (generation,))
+        for name_1, name_2, wins_1, wins_2 in rows:
+            for name, wins in ((name_1, wins_1), (name_2, wins_2)):
+                won, played = totals.get(name, (0, 0))
+                totals[name] = (won + wins, played + wins_1 + wins_2)
+        return totals
+
+    def save_generation(self, generation, names, distribution, viabilities):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?)",
+                [(generation, name, float(share), float(viability))
+                 for name, share, viability in zip(names, distribution, viabilities)])
+
+    def last_generation(self):
+        row = self.db.execute("SELECT MAX(generation) FROM matches").fetchone()
+        return row[0] if row[0] is not None else 0
+
+    def history(self):
+        """(generations, names, distributions (G, N), viabilities (G, N)); NaN where absent"""
+        names = list(self.players())
+        column = {name: i for i, name in enumerate(names)}
+        rows = self.db.execute(
+            "SELECT generation, name, share, viability FROM generations ORDER BY generation"
+        ).fetchall()
+        generations = sorted({row[0] for row in rows})
+        index = {generation: i for i, generation in enumerate(generations)}
+        distributions = np.full((len(generations), len(names)), np.nan)
+        viabilities = np.full_like(distributions, np.nan)
+        for generation, name, share, viability in rows:
+            distributions[index[generation], column[name]] = share
+            viabilities[index[generation], column[name]] = viability
+        return generations, names, distributions, viabilities
+
+
+class League:
+    """
+    Self-play league of RLPlayer snapshots and the heuristic bots.
+
+    Each generation every member is matched against opponents sampled with
+    weight exp(-|Δelo| / proximity), the matches run on the offline engine,
+    and ratings are updated in the RatingStore. The generation's meta is
+    summarised as a strategy distribution (Bradley-Terry shares of the Elo
+    ratings, i.e. how often a rating-proportional meta would pick each
+    member) and viabilities (observed win rates), which SystemicEntropyModel
+    turns into H and VCI.
+    """
+
+    def __init__(self, store_path="league.sqlite", battles_per_match=20, proximity=200.0,
+                 seed=None, engine=None):
+        self.store = RatingStore(store_path)
+        self.battles_per_match = battles_per_match
+        self.proximity = proximity
+        self.rng = np.random.default_rng(seed)
+        self.engine = engine if engine is not None else OfflineBattleEngine(seed=seed)
+        self.entropy_model = SystemicEntropyModel()
+        self.generation = self.store.last_generation()
+        self._players = {}
+
+        # Members from an earlier session come back from the store
+        for name, (kind, source) in self.store.players().items():
+            if kind == "snapshot":
+                self._players[name] = self.engine.attach(self._load_snapshot(source))
+            elif name in HEURISTIC_BOTS:
+                self._players[name] = self.engine.attach(HEURISTIC_BOTS[name](start_listening=False))
+
+    @property
+    def names(self):
+        return list(self._players)
+
+    def add_heuristic_bots(self, bots=HEURISTIC_BOTS):
+        for name, cls in bots.items():
+            self.add_player(name, cls(start_listening=False), kind="heuristic")
+        return self
+
+    def add_snapshot(self, model_path, name=None):
+        """Add a saved PPO model (e.g. an rl_training checkpoint) as a league member"""
+        model_path = Path(model_path)
+        name = name or model_path.stem
+        self.add_player(name, self._load_snapshot(model_path), kind="snapshot", source=model_path)
+        return name
+
+    def add_snapshots(self, checkpoint_dir, pattern="*.zip"):
+        return [self.add_snapshot(path) for path in sorted(Path(checkpoint_dir).glob(pattern))
+                if path.stem not in self._players]
+
+    def add_player(self, name, player, kind="custom", source=""):
+        self._players[name] = self.engine.attach(player)
+        self.store.register(name, kind, source, self.generation)
+
+    @staticmethod
+    def _load_snapshot(model_path):
+        from stable_baselines3 import PPO
+
+        player = RLPlayer(start_listening=False)
+        player.model = PPO.load(model_path, device="cpu")
+        return player
+
+    def schedule(self, matches_per_player=1):
+        """Pairs of member names, each member picking opponents near its own rating"""
+        names = self.names
+        if len(names) < 2:
+            return []
+        elo = np.array([self.store.rating(name).elo for name in names])
+        weights = np.exp(-np.abs(elo[:, None] - elo[None, :]) / self.proximity)
+        np.fill_diagonal(weights, 0.0)
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        pairs = []
+        for _ in range(matches_per_player):
+            for i in self.rng.permutation(len(names)):
+                j = self.rng.choice(len(names), p=weights[i])
+                pairs.append((names[i], names[j]))
+        return pairs
+
+    def play_generation(self, matches_per_player=1):
+        """Schedule, play and rate one generation; returns its GenerationReport"""
+        self.generation += 1
+        for name_1, name_2 in self.schedule(matches_per_player):
+            result = self.engine.play(self._players[name_1], self._players[name_2],
+                                      self.battles_per_match)
+            self.store.record(self.generation, name_1, name_2, result.winners)
+        return self.report(self.generation)
+
+    def run(self, n_generations, matches_per_player=1):
+        return [self.play_generation(matches_per_player) for _ in range(n_generations)]
+
+    def meta_distribution(self, names=None):
+        """Bradley-Terry shares 10^(elo/400), normalised over the given members"""
+        names = self.names if names is None else names
+        elo = np.array([self.store.rating(name).elo for name in names])
+        strength = np.exp((elo - elo.max()) * math.log(10) / 400)
+        return strength / strength.sum()
+
+    def report(self, generation):
+        totals = self.store.generation_results(generation)
+        names = [name for name in self.names if name in totals]
+        distribution = self.meta_distribution(names)
+        viabilities = np.array([totals[name][0] / totals[name][1] for name in names])
+        self.store.save_generation(generation, names, distribution, viabilities)
+
+        _, _, _, history = self.store.history()
+        first = history[0][~np.isnan(history[0])]
+        return GenerationReport(
+            generation, names, distribution, viabilities,
+            float(self.entropy_model.calculate_strategic_entropy(distribution)),
+            float(self.entropy_model.calculate_viability_compression_index(first, viabilities)))
+
+    def trajectory(self, counterplay_index=1.0):
+        """
+        Generation-by-generation dicts for BoringnessPredictor.predict_long_term_boringness.
+
+        Members absent from a generation get share 0 and that generation's mean
+        viability, so they add no variance; viabilities_before is always the
+        first recorded generation.
+        """
+        _, _, distributions, viabilities = self.store.history()
+        if len(distributions) == 0:
+            return []
+        distributions = np.nan_to_num(distributions)
+        means = np.nanmean(viabilities, axis=1, keepdims=True)
+        viabilities = np.where(np.isnan(viabilities), means, viabilities)
+        return [
+            {
+                'strategy_distribution': distribution,
+                'viabilities_before': viabilities[0],
+                'viabilities_after': after,
+                'counterplay_index': counterplay_index,
+            }
+            for distribution, after in zip(distributions, viabilities)
+        ]
+
+    def standings(self):
+        return self.store.ratings()
+
+    def close(self):
+        self.store.close()
+
+
+if __name__ == "__main__":
+    league = League(seed=0).add_heuristic_bots()
+    league.add_snapshots("checkpoints")
+    for report in league.run(5):
+        print(f"Generation {report.generation}: H={report.H:.3f} VCI={report.VCI:.3f}")
+    for rating in league.standings():
+        print(f"{rating.name}: Elo {rating.elo:.0f}, TrueSkill {rating.mu:.1f}±{rating.sigma:.1f}")
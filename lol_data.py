@@ -0,0 +1,223 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from battle_log import DATA_DIR
+from matchup_matrix import MatchupMatrix
+from systemic_entropy import SystemicEntropyModel
+
+LOL_DIR = DATA_DIR / 'league_of_legends_match'
+CHAMPION_JSON = LOL_DIR / 'champion_info_2.json'
+LEGACY_CHAMPION_JSON = LOL_DIR / 'champion_info.json'
+SUMMONER_SPELL_JSON = LOL_DIR / 'summoner_spell_info.json'
+# Ranked match export these tables belong to (not shipped; one row per game)
+GAMES_CSV = LOL_DIR / 'games.csv'
+
+TEAM_SIZE = 5
+# Riot's "no champion" entry (empty ban slots); maps to row -1 like any unknown id
+NO_CHAMPION = -1
+ROLE_TAGS = ('Assassin', 'Fighter', 'Mage', 'Marksman', 'Support', 'Tank')
+
+PICK_COLUMNS = [f"t{team}_champ{slot}id" for team in (1, 2) for slot in range(1, TEAM_SIZE + 1)]
+BAN_COLUMNS = [f"t{team}_ban{slot}" for team in (1, 2) for slot in range(1, TEAM_SIZE + 1)]
+SPELL_COLUMNS = [f"t{team}_champ{slot}_sum{spell}" for team in (1, 2)
+                 for slot in range(1, TEAM_SIZE + 1) for spell in (1, 2)]
+
+
+class IdTable:
+    """
+    Dense rows for sparse Riot ids.
+
+    ids, names and keys are row-aligned arrays; rows() maps any array of ids
+    to rows through a precomputed lookup array (-1 for unknown ids and for
+    NO_CHAMPION), so per-match translation is one fancy index.
+    """
+
+    def __init__(self, ids, names, keys):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = np.asarray(names, dtype=object)
+        self.keys = np.asarray(keys, dtype=object)
+        self.lookup = np.full(self.ids.max() + 1, -1, dtype=np.int64)
+        self.lookup[self.ids] = np.arange(self.ids.size)
+
+    def __len__(self):
+        return self.ids.size
+
+    def rows(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        known = (ids >= 0) & (ids < self.lookup.size)
+        return np.where(known, self.lookup[np.where(known, ids, 0)], -1)
+
+    def row(self, name):
+        """Row of a display name or key"""
+        matches = np.flatnonzero((self.names == name) | (self.keys == name))
+        if not matches.size:
+            raise KeyError(name)
+        return int(matches[0])
+
+
+class ChampionTable(IdTable):
+    """Champions plus a (champions, ROLE_TAGS) multi-hot role matrix"""
+
+    def __init__(self, ids, names, keys, titles, roles):
+        super().__init__(ids, names, keys)
+        self.titles = np.asarray(titles, dtype=object)
+        self.roles = np.asarray(roles, dtype=bool)
+
+
+class SpellTable(IdTable):
+    """Summoner spells with the summoner level that unlocks them"""
+
+    def __init__(self, ids, names, keys, summoner_levels):
+        super().__init__(ids, names, keys)
+        self.summoner_levels = np.asarray(summoner_levels, dtype=np.int64)
+
+
+def load_champions(path=CHAMPION_JSON, legacy_path=LEGACY_CHAMPION_JSON):
+    """
+    ChampionTable sorted by id from champion_info_2.json (keyed by name).
+
+    The "None" entry (id -1) is dropped; champions only present in the
+    id-keyed champion_info.json are added without role tags.
+    """
+    entries = {entry['id']: entry for entry in _read_data(path).values() if entry['id'] != NO_CHAMPION}
+    if legacy_path is not None and legacy_path.exists():
+        for entry in _read_data(legacy_path).values():
+            entries.setdefault(entry['id'], entry)
+
+    ordered = [entries[champion_id] for champion_id in sorted(entries)]
+    roles = [[tag in entry.get('tags', ()) for tag in ROLE_TAGS] for entry in ordered]
+    return ChampionTable([entry['id'] for entry in ordered],
+                         [entry['name'] for entry in ordered],
+                         [entry['key'] for entry in ordered],
+                         [entry['title'] for entry in ordered],
+                         np.reshape(roles, (len(ordered), len(ROLE_TAGS))))
+
+
+def load_summoner_spells(path=SUMMONER_SPELL_JSON):
+    """SpellTable sorted by id from summoner_spell_info.json"""
+    ordered = sorted(_read_data(path).values(), key=lambda entry: entry['id'])
+    return SpellTable([entry['id'] for entry in ordered],
+                      [entry['name'] for entry in ordered],
+                      [entry['key'] for entry in ordered],
+                      [entry['summonerLevel'] for entry in ordered])
+
+
+def _read_data(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)['data']
+
+
+class DraftAggregator:
+    """
+    Streaming pick / ban / win / spell counts over ranked match exports.
+
+    Every chunk of games (t{1,2}_champ{k}id, t{1,2}_ban{k}, winner 1 or 2 and
+    optionally the summoner spell columns) is translated to champion rows
+    with one lookup and folded into id-indexed counters with bincount, so
+    match files of any size stream through in bounded memory. Cross-team
+    pairs of the winning and losing five add to a champion-vs-champion win
+    matrix, so champions get a MatchupMatrix (equilibrium, exploitability)
+    just like the Pokémon combats, and usage shares and win rates feed the
+    same SystemicEntropyModel entropy and VCI functions.
+    """
+
+    def __init__(self, champions=None, spells=None):
+        self.champions = champions if champions is not None else load_champions()
+        self.spells = spells if spells is not None else load_summoner_spells()
+        n = len(self.champions)
+        self.games = 0
+        self.picks = np.zeros(n, dtype=np.int64)
+        self.bans = np.zeros(n, dtype=np.int64)
+        self.wins = np.zeros(n, dtype=np.int64)
+        self.spell_picks = np.zeros(len(self.spells), dtype=np.int64)
+        self.head_to_head = np.zeros((n, n), dtype=np.int64)
+        self.entropy_model = SystemicEntropyModel()
+
+    def update(self, games):
+        """Fold one DataFrame chunk of games into the counters"""
+        n = len(self.champions)
+        picks = self.champions.rows(games[PICK_COLUMNS].to_numpy()).reshape(-1, 2, TEAM_SIZE)
+        bans = self.champions.rows(games[BAN_COLUMNS].to_numpy())
+        first_won = games['winner'].to_numpy() == 1
+
+        self.games += len(games)
+        self.picks += _count(picks, n)
+        self.bans += _count(bans, n)
+        winners = np.where(first_won[:, None], picks[:, 0], picks[:, 1])
+        losers = np.where(first_won[:, None], picks[:, 1], picks[:, 0])
+        self.wins += _count(winners, n)
+
+        pairs_won = np.broadcast_to(winners[:, :, None], winners.shape + (TEAM_SIZE,))
+        pairs_lost = np.broadcast_to(losers[:, None, :], pairs_won.shape)
+        known = (pairs_won >= 0) & (pairs_lost >= 0)
+        self.head_to_head += np.bincount(pairs_won[known] * n + pairs_lost[known],
+                                         minlength=n * n).reshape(n, n)
+
+        if all(column in games for column in SPELL_COLUMNS):
+            self.spell_picks += _count(self.spells.rows(games[SPELL_COLUMNS].to_numpy()),
+                                       len(self.spells))
+        return self
+
+    def stream(self, path=GAMES_CSV, chunksize=100_000):
+        """Aggregate a games CSV chunk by chunk (only the needed columns are parsed)"""
+        header = pd.read_csv(path, nrows=0).columns
+        columns = ['winner'] + PICK_COLUMNS + BAN_COLUMNS
+        columns += [column for column in SPELL_COLUMNS if column in header]
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, dtype=np.int64):
+            self.update(chunk)
+        return self
+
+    @classmethod
+    def from_csv(cls, path=GAMES_CSV, chunksize=100_000, **kwargs):
+        return cls(**kwargs).stream(path, chunksize)
+
+    def pick_rates(self):
+        """Share of games each champion is picked in"""
+        return self.picks / max(self.games, 1)
+
+    def ban_rates(self):
+        return self.bans / max(self.games, 1)
+
+    def win_rates(self):
+        """Win rate per champion (nan if never picked)"""
+        rates = np.full(self.picks.size, np.nan)
+        picked = self.picks > 0
+        rates[picked] = self.wins[picked] / self.picks[picked]
+        return rates
+
+    def strategy_distribution(self):
+        """Champion usage share, the p* of the streaming estimators"""
+        total = self.picks.sum()
+        return self.picks / total if total else np.zeros(self.picks.size)
+
+    def role_distribution(self):
+        """Pick share per ROLE_TAGS role; multi-role champions split their picks evenly"""
+        roles = self.champions.roles.astype(np.float64)
+        tags = roles.sum(axis=1, keepdims=True)
+        shares = np.divide(roles, tags, out=np.zeros_like(roles), where=tags > 0)
+        usage = self.picks @ shares
+        total = usage.sum()
+        return usage / total if total else usage
+
+    def entropy(self):
+        return float(self.entropy_model.calculate_strategic_entropy_batch(self.strategy_distribution()))
+
+    def role_entropy(self):
+        return float(self.entropy_model.calculate_strategic_entropy_batch(self.role_distribution()))
+
+    def viability_compression_index(self, before, variance_floor=0.0):
+        """Var[win rates of `before` (an earlier DraftAggregator)] / Var[win rates now]"""
+        return float(self.entropy_model.calculate_viability_compression_index_batch(
+            before.win_rates(), self.win_rates(), variance_floor=variance_floor))
+
+    def matchups(self):
+        """MatchupMatrix over champion rows (self.champions.ids maps rows back to ids)"""
+        return MatchupMatrix(self.head_to_head, id_offset=0)
+
+
+def _count(rows, n):
+    """bincount of the valid (>= 0) rows"""
+    rows = np.asarray(rows).ravel()
+    return np.bincount(rows[rows >= 0], minlength=n)
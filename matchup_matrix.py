@@ -0,0 +1,218 @@
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from battle_log import load_combats
+from systemic_entropy import SystemicEntropyModel
+
+# Default step sizes of batched_equilibrium on payoffs scaled to [-1, 1]
+EQUILIBRIUM_STEP_SIZES = {'hedge': 1.0, 'replicator': 0.5}
+
+
+class MatchupMatrix:
+    """
+    Sparse pairwise win counts between strategies and the symmetric zero-sum
+    game they imply.
+
+    wins[i, j] counts how often strategy i beat strategy j. The payoff of i
+    against j is the win-rate margin (wins_ij - wins_ji) / games_ij, which is
+    antisymmetric, so the game value is 0 and the equilibrium p* is the mix
+    no observed strategy can exploit.
+    """
+
+    def __init__(self, wins, id_offset=1):
+        self.wins = sp.csr_matrix(wins, dtype=np.float64)
+        self.id_offset = id_offset
+        self.n_strategies = self.wins.shape[0]
+
+        self.games = (self.wins + self.wins.T).tocsr()
+        margin = (self.wins - self.wins.T).tocsr()
+        margin.setdiag(0)
+        margin.eliminate_zeros()
+        # Divide only the stored entries; unobserved pairs stay implicit zeros
+        rows, cols = margin.nonzero()
+        values = np.asarray(margin[rows, cols]).ravel() / np.asarray(self.games[rows, cols]).ravel()
+        self.payoff = sp.csr_matrix((values, (rows, cols)), shape=self.wins.shape)
+        self.observed = np.asarray(self.games.sum(axis=1)).ravel() > 0
+        # Set by solve_equilibrium
+        self.equilibrium_exploitability = None
+
+    @classmethod
+    def from_outcomes(cls, first, second, winner, n_strategies=None, id_offset=1):
+        """Aggregate raw (first, second, winner) id columns into win counts"""
+        first = np.asarray(first, dtype=np.int64) - id_offset
+        second = np.asarray(second, dtype=np.int64) - id_offset
+        winner = np.asarray(winner, dtype=np.int64) - id_offset
+        unmatched = (winner != first) & (winner != second)
+        if unmatched.any():
+            row = int(np.flatnonzero(unmatched)[0])
+            raise ValueError(f"{int(unmatched.sum())} outcomes name a winner that did not play "
+                             f"(first at row {row}: winner {winner[row] + id_offset})")
+        loser = np.where(winner == first, second, first)
+        if n_strategies is None:
+            n_strategies = int(max(first.max(), second.max())) + 1
+
+        # One pass of counting over flattened (winner, loser) keys; only observed pairs are stored
+        keys, counts = np.unique(winner * n_strategies + loser, return_counts=True)
+        wins = sp.coo_matrix((counts.astype(np.float64),
+                              (keys // n_strategies, keys % n_strategies)),
+                             shape=(n_strategies, n_strategies))
+        return cls(wins, id_offset=id_offset)
+
+    @classmethod
+    def from_combats(cls, n_strategies=None, cache_dir=None):
+        """Build the Pokémon matchup matrix from data/pokemon_battle/combats.csv"""
+        log = load_combats(cache_dir)
+        return cls.from_outcomes(log['First_pokemon'], log['Second_pokemon'], log['Winner'],
+                                 n_strategies=n_strategies)
+
+    def win_rates(self):
+        """Overall empirical win rate of every strategy (nan if never played)"""
+        won = np.asarray(self.wins.sum(axis=1)).ravel()
+        played = np.asarray(self.games.sum(axis=1)).ravel()
+        rates = np.full(self.n_strategies, np.nan)
+        rates[self.observed] = won[self.observed] / played[self.observed]
+        return rates
+
+    def exploitability(self, p):
+        """Best pure-strategy payoff against the mix p (0 at equilibrium)"""
+        return float((self.payoff @ p)[self.observed].max())
+
+    def solve_equilibrium(self, method='lp', iterations=20000, tol=1e-3):
+        """
+        Equilibrium mix over all strategies (zero weight on unobserved ones).
+
+        method='lp' solves max v s.t. payoffᵀp >= v with HiGHS on the sparse
+        matrix; method='fictitious_play' runs sparse best-response iterations
+        until exploitability drops below tol, which scales to very large pools.
+        The exploitability of the result is kept in
+        self.equilibrium_exploitability; if fictitious play runs out of
+        iterations above tol, a RuntimeWarning says so.
+        """
+        index = np.flatnonzero(self.observed)
+        payoff = self.payoff[index][:, index]
+
+        if method == 'lp':
+            p_observed = _solve_lp(payoff)
+        elif method == 'fictitious_play':
+            p_observed = _fictitious_play(payoff, iterations, tol)
+        else:
+            raise ValueError(f"Unknown equilibrium method: {method}")
+
+        p = np.zeros(self.n_strategies)
+        p[index] = p_observed
+        self.equilibrium_exploitability = self.exploitability(p)
+        if method == 'fictitious_play' and self.equilibrium_exploitability >= tol:
+            warnings.warn(f"fictitious play stopped after {iterations} iterations with "
+                          f"exploitability {self.equilibrium_exploitability:.4g} (tol {tol:g})",
+                          RuntimeWarning, stacklevel=2)
+        return p
+
+    def equilibrium_entropy(self, **solver_kwargs):
+        """H(p*) of the empirical equilibrium"""
+        p = self.solve_equilibrium(**solver_kwargs)
+        return SystemicEntropyModel().calculate_strategic_entropy(p)
+
+    def strategy_id(self, index):
+        """Row index -> original id"""
+        return index + self.id_offset
+
+
+def _solve_lp(payoff):
+    """max v s.t. Σ_i p_i A_ij >= v for all j, Σ p = 1, p >= 0"""
+    n = payoff.shape[0]
+    # Variables are [p_0 .. p_{n-1}, v]; linprog minimizes, so minimize -v
+    cost = np.zeros(n + 1)
+    cost[-1] = -1.0
+    A_ub = sp.hstack([-payoff.T, sp.csr_matrix(np.ones((n, 1)))], format='csr')
+    b_ub = np.zeros(n)
+    A_eq = sp.csr_matrix(np.append(np.ones(n), 0.0)[None, :])
+    bounds = [(0, None)] * n + [(None, None)]
+
+    result = linprog(cost, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0],
+                     bounds=bounds, method='highs')
+    if not result.success:
+        raise RuntimeError(f"Equilibrium LP failed: {result.message}")
+    p = np.maximum(result.x[:n], 0.0)
+    return p / p.sum()
+
+
+def _fictitious_play(payoff, iterations, tol):
+    """Symmetric fictitious play; the empirical mix converges to p*"""
+    n = payoff.shape[0]
+    counts = np.zeros(n)
+    counts[0] = 1.0
+    for step in range(1, iterations + 1):
+        mix = counts / step
+        values = payoff @ mix
+        best = np.argmax(values)
+        if values[best] < tol:
+            break
+        counts[best] += 1.0
+    return counts / counts.sum()
+
+
+def batched_equilibrium(payoffs, support=None, iterations=2000, method='hedge', step_size=None,
+                        tol=1e-3, check_every=50):
+    """
+    Approximate p* for a stack of symmetric zero-sum games in lockstep.
+
+    payoffs is (games, n, n), antisymmetric per game; support (games, n)
+    restricts each game to a subset of strategies. method='hedge' runs
+    optimistic multiplicative weights in self-play, method='replicator'
+    discrete replicator dynamics; both return the time-averaged mix. Every
+    iteration is one batched matrix-vector product; iteration stops once all
+    games are within tol of equilibrium on the [-1, 1] payoff scale.
+    Returns (p (games, n), exploitability, converged), where converged marks
+    the games that reached tol within the iteration budget.
+    """
+    payoffs = np.asarray(payoffs, dtype=np.float64)
+    n_games, n, _ = payoffs.shape
+    support = np.ones((n_games, n), dtype=bool) if support is None else np.asarray(support, bool)
+    empty = ~support.any(axis=1)
+    support = support | empty[:, None]
+
+    # Payoffs are rescaled to [-1, 1] per game so one step size fits all
+    scale = np.abs(payoffs).max(axis=(1, 2))
+    scale[scale == 0] = 1.0
+    unit = payoffs / scale[:, None, None]
+    if method not in EQUILIBRIUM_STEP_SIZES:
+        raise ValueError(f"Unknown equilibrium method: {method}")
+    eta = step_size if step_size is not None else EQUILIBRIUM_STEP_SIZES[method]
+
+    p = support / support.sum(axis=1, keepdims=True)
+    log_weights = np.where(support, 0.0, -np.inf)
+    previous = np.zeros((n_games, n))
+    average = np.zeros((n_games, n))
+    for step in range(1, iterations + 1):
+        values = np.matmul(unit, p[:, :, None])[:, :, 0]
+        if method == 'hedge':
+            log_weights += eta * (2 * values - previous)
+            previous = values
+            log_weights -= log_weights.max(axis=1, keepdims=True)
+            p = np.exp(log_weights)
+        else:
+            fitness = values - (p * values).sum(axis=1, keepdims=True)
+            p = np.maximum(p * (1.0 + eta * fitness), 0.0)
+        p /= p.sum(axis=1, keepdims=True)
+        average += p
+
+        if step % check_every == 0 or step == iterations:
+            mix = average / step
+            gap = batched_exploitability(unit, mix, support)
+            if (gap < tol).all():
+                break
+
+    mix = average / step
+    converged = batched_exploitability(unit, mix, support) < tol
+    return mix, batched_exploitability(payoffs, mix, support), converged
+
+
+def batched_exploitability(payoffs, p, support=None):
+    """Best supported pure-strategy payoff against each game's mix p"""
+    values = np.matmul(payoffs, p[:, :, None])[:, :, 0]
+    if support is not None:
+        values = np.where(support, values, -np.inf)
+    return values.max(axis=1)
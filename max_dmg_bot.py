@@ -2,6 +2,8 @@ from poke_env.player import Player
 from poke_env import RandomPlayer
 import asyncio
 
+from action_scoring import ActionScorer, MAX_DAMAGE_WEIGHTS
+
 
 class MaxDamagePlayer(Player):
     """
@@ -9,32 +11,25 @@ class MaxDamagePlayer(Player):
     or switches to Pokemon with more HP when needed.
     """
 
+    def __init__(self, *args, action_weights=MAX_DAMAGE_WEIGHTS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.action_scorer = ActionScorer(action_weights)
+
     def choose_move(self, battle):
-        # If we have available moves, pick the strongest one
-        if battle.available_moves:
-            # Find move with highest base power
-            best_move = max(battle.available_moves, key=lambda move: move.base_power)
-            return self.create_order(best_move)
-
-        # If no moves available, try to switch to a healthier Pokemon
-        elif battle.available_switches:
-            # Switch to Pokemon with highest HP percentage
-            best_switch = max(
-                battle.available_switches,
-                key=lambda pokemon: pokemon.current_hp_fraction,
-            )
-            return self.create_order(best_switch)
+        # Highest base power move; if no moves are available, the healthiest switch
+        best_action = self.action_scorer.choose(battle)
+        if best_action is not None:
+            return self.create_order(best_action)
 
         # Fallback to random move
         return self.choose_random_move(battle)
 
 
-# Create players
-max_damage_bot = MaxDamagePlayer()
-random_bot = RandomPlayer()
-
-
 async def main():
+    # Create players
+    max_damage_bot = MaxDamagePlayer()
+    random_bot = RandomPlayer()
+
     # Battle them against each other
     await max_damage_bot.battle_against(random_bot, n_battles=10)
 
@@ -43,4 +38,5 @@ async def main():
 
 
 # Run the battles
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
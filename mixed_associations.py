@@ -0,0 +1,196 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+NUMERIC = 'numeric'
+NOMINAL = 'nominal'
+
+
+class AssociationMatrix:
+    """Square association matrix with its column labels and column kinds"""
+
+    def __init__(self, values, columns, kinds):
+        self.values = values
+        self.columns = list(columns)
+        self.kinds = list(kinds)
+        self._index = {column: i for i, column in enumerate(self.columns)}
+
+    def __getitem__(self, pair):
+        a, b = pair
+        return self.values[self._index[a], self._index[b]]
+
+    def to_frame(self):
+        return pd.DataFrame(self.values, index=self.columns, columns=self.columns)
+
+    def __repr__(self):
+        return f"AssociationMatrix({len(self.columns)} columns)"
+
+
+class AssociationEngine:
+    """
+    Headless replacement for dython's associations() on mixed data.
+
+    - Pearson's r for numeric-numeric (pairwise complete, one masked product)
+    - Cramér's V for nominal-nominal, bias corrected (Bergsma 2013), with
+      Yates' correction on 2×2 tables like scipy's chi2_contingency
+    - Correlation ratio η for nominal-numeric
+
+    Every nominal column is factorized once into a sparse one-hot block
+    (missing values are their own level) and cached on the engine, so all
+    contingency tables come from one O^T O product and all category means
+    from O^T X. Nominal column blocks can be processed on threads; NumPy
+    and SciPy release the GIL in the products.
+    """
+
+    def __init__(self, df, nominal_columns='auto', bias_correction=True, n_jobs=1, block_size=8):
+        self.df = df
+        self.bias_correction = bias_correction
+        self.n_jobs = n_jobs
+        self.block_size = block_size
+        if nominal_columns == 'auto':
+            nominal_columns = [column for column in df.columns
+                               if not pd.api.types.is_numeric_dtype(df[column])
+                               or pd.api.types.is_bool_dtype(df[column])]
+        elif nominal_columns == 'all':
+            nominal_columns = list(df.columns)
+        self.nominal_columns = [column for column in df.columns if column in set(nominal_columns)]
+        self.numeric_columns = [column for column in df.columns
+                                if column not in set(self.nominal_columns)]
+        self._encoded = {}
+
+    def encode(self, column):
+        """Cached (codes, n_levels) for a nominal column"""
+        if column not in self._encoded:
+            codes, levels = pd.factorize(self.df[column], use_na_sentinel=False)
+            self._encoded[column] = (codes.astype(np.int64), len(levels))
+        return self._encoded[column]
+
+    def one_hot(self, columns):
+        """Sparse (rows, levels) indicator matrix and each column's level offsets"""
+        n = len(self.df)
+        blocks, offsets = [], [0]
+        for column in columns:
+            codes, n_levels = self.encode(column)
+            blocks.append(sparse.csr_matrix(
+                (np.ones(n), (np.arange(n), codes)), shape=(n, n_levels)))
+            offsets.append(offsets[-1] + n_levels)
+        if not blocks:
+            return sparse.csr_matrix((n, 0)), np.array(offsets)
+        return sparse.hstack(blocks, format='csr'), np.array(offsets)
+
+    def compute(self, columns=None):
+        """AssociationMatrix over columns (default: every column of the frame)"""
+        columns = list(self.df.columns) if columns is None else list(columns)
+        nominal = [column for column in columns if column in self.nominal_columns]
+        numeric = [column for column in columns if column not in set(nominal)]
+        position = {column: i for i, column in enumerate(columns)}
+        num_idx = np.array([position[column] for column in numeric], dtype=np.int64)
+        nom_idx = np.array([position[column] for column in nominal], dtype=np.int64)
+
+        values = np.eye(len(columns))
+        X, mask = self._numeric_matrix(numeric)
+        if numeric:
+            values[np.ix_(num_idx, num_idx)] = _pearson(X, mask)
+        if nominal:
+            onehot, offsets = self.one_hot(nominal)
+            blocks = [range(start, min(start + self.block_size, len(nominal)))
+                      for start in range(0, len(nominal), self.block_size)]
+            work = lambda block: self._nominal_block(block, onehot, offsets, X, mask)
+            if self.n_jobs > 1 and len(blocks) > 1:
+                with ThreadPoolExecutor(self.n_jobs) as pool:
+                    results = list(pool.map(work, blocks))
+            else:
+                results = [work(block) for block in blocks]
+
+            for block, (cramers, eta) in zip(blocks, results):
+                rows = nom_idx[list(block)]
+                values[np.ix_(rows, nom_idx)] = cramers
+                values[np.ix_(nom_idx, rows)] = cramers.T
+                if numeric:
+                    values[np.ix_(rows, num_idx)] = eta
+                    values[np.ix_(num_idx, rows)] = eta.T
+            values[nom_idx, nom_idx] = 1.0
+
+        kinds = [NOMINAL if column in set(nominal) else NUMERIC for column in columns]
+        return AssociationMatrix(values, columns, kinds)
+
+    def _numeric_matrix(self, numeric):
+        X = self.df[numeric].to_numpy(dtype=np.float64, na_value=np.nan) if numeric \
+            else np.empty((len(self.df), 0))
+        mask = ~np.isnan(X)
+        return np.where(mask, X, 0.0), mask.astype(np.float64)
+
+    def _nominal_block(self, block, onehot, offsets, X, mask):
+        """Cramér's V of block columns against all nominal columns, η against numerics"""
+        lo, hi = offsets[block[0]], offsets[block[-1] + 1]
+        rows = onehot[:, lo:hi]
+        contingency = (rows.T @ onehot).toarray()
+        n_nominal = len(offsets) - 1
+        cramers = np.empty((len(block), n_nominal))
+        for i, a in enumerate(block):
+            ra = slice(offsets[a] - lo, offsets[a + 1] - lo)
+            for b in range(n_nominal):
+                table = contingency[ra, offsets[b]:offsets[b + 1]]
+                cramers[i, b] = _cramers_v(table, self.bias_correction)
+
+        eta = np.empty((len(block), X.shape[1]))
+        if X.shape[1]:
+            counts = (rows.T @ mask)           # valid observations per level
+            sums = (rows.T @ X)
+            for i, a in enumerate(block):
+                ra = slice(offsets[a] - lo, offsets[a + 1] - lo)
+                eta[i] = _correlation_ratio(counts[ra], sums[ra], X, mask)
+        return cramers, eta
+
+
+def _pearson(X, mask):
+    """Pairwise-complete Pearson r from masked cross products"""
+    n = mask.T @ mask
+    sx = X.T @ mask                 # Σx over rows where both are present
+    sxx = (X * X).T @ mask
+    sxy = X.T @ X
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sx.T / n
+        var_x = sxx - sx * sx / n
+        r = cov / np.sqrt(var_x * var_x.T)
+    r = np.clip(np.nan_to_num(r), -1.0, 1.0)
+    np.fill_diagonal(r, 1.0)
+    return r
+
+
+def _cramers_v(table, bias_correction=True):
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    r, k = table.shape
+    if r < 2 or k < 2:
+        return 0.0
+    n = table.sum()
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+    deviation = np.abs(table - expected)
+    if r == 2 and k == 2:
+        deviation = np.maximum(deviation - 0.5, 0.0)
+    phi2 = (deviation ** 2 / expected).sum() / n
+    if bias_correction:
+        phi2 = max(0.0, phi2 - (k - 1) * (r - 1) / (n - 1))
+        r = r - (r - 1) ** 2 / (n - 1)
+        k = k - (k - 1) ** 2 / (n - 1)
+    denominator = min(k - 1, r - 1)
+    return float(np.sqrt(phi2 / denominator)) if denominator > 0 else 0.0
+
+
+def _correlation_ratio(counts, sums, X, mask):
+    """η of one nominal column against every numeric column (levels × numerics inputs)"""
+    n = counts.sum(axis=0)
+    total = sums.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        between = np.where(counts > 0, sums ** 2 / np.where(counts > 0, counts, 1), 0.0).sum(axis=0) \
+            - total ** 2 / n
+        overall = (X * X).sum(axis=0) - total ** 2 / n
+        eta = np.sqrt(np.clip(between / overall, 0.0, 1.0))
+    return np.nan_to_num(eta)
+
+
+def associations(df, nominal_columns='auto', **kwargs):
+    """Association matrix as a DataFrame (dython's associations(...)['corr'], no plot)"""
+    return AssociationEngine(df, nominal_columns, **kwargs).compute().to_frame()
@@ -0,0 +1,493 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from battle_log import DATA_DIR
+from type_effectiveness import TYPE_INDEX, TYPE_NAMES, effectiveness_table, gen_type_chart
+
+POKEMON_CSV = DATA_DIR / 'pokemon_battle' / 'pokemon.csv'
+# Generation the simplified rules follow (type chart, four moves per species)
+OFFLINE_GEN = 9
+
+# poke_env's chart for the simulated generation (layout: TYPE_CHART[defender][attacker])
+TYPE_CHART = gen_type_chart(OFFLINE_GEN)
+
+# Action codes used by step(): moves 0-3, switch to team slot 0-5, struggle
+MOVE_ACTIONS = 4
+SWITCH_OFFSET = 4
+STRUGGLE = 10
+NO_ACTION = -1
+
+# Move slot templates: (power, accuracy as a 0-1 hit chance like poke_env's, priority, pp);
+# slot 3 heals 25% HP
+MOVE_SLOTS = (
+    (90, 1.0, 0, 16),   # STAB of the first type
+    (90, 1.0, 0, 16),   # STAB of the second type (Normal 70 for mono-types)
+    (40, 1.0, 1, 30),   # Normal priority hit
+    (0, 1.0, 0, 8),     # Recover-style status move
+)
+HEAL_FRACTION = 0.25
+STRUGGLE_POWER = 50
+
+SimFormat = namedtuple('SimFormat', ['name', 'type_chart'])
+SimCategory = namedtuple('SimCategory', ['name'])
+PHYSICAL, SPECIAL, STATUS = SimCategory('PHYSICAL'), SimCategory('SPECIAL'), SimCategory('STATUS')
+OfflineResult = namedtuple('OfflineResult', ['wins', 'winners', 'turns'])
+
+
+class SimType:
+    """Stand-in for poke_env's PokemonType (name + damage_multiplier)"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def damage_multiplier(self, type_1, type_2=None, *, type_chart):
+        multiplier = type_chart[type_1.name][self.name]
+        if type_2 is not None:
+            multiplier *= type_chart[type_2.name][self.name]
+        return multiplier
+
+    def __repr__(self):
+        return f"{self.name} (type)"
+
+
+SIM_TYPES = tuple(SimType(name) for name in TYPE_NAMES)
+
+
+class SimMove:
+    """Read-only view of one move slot, shaped like poke_env's Move"""
+
+    def __init__(self, engine, battle, side, slot, index):
+        self._engine, self._key = engine, (battle, side, slot)
+        self._index = index
+        species = engine.species[battle, side, slot]
+        self.id = engine.move_ids[species][index]
+        self.type = SIM_TYPES[engine.move_types[species, index]]
+        self.base_power = int(engine.move_power[species, index])
+        self.accuracy = MOVE_SLOTS[index][1]
+        self.priority = MOVE_SLOTS[index][2]
+        self.max_pp = MOVE_SLOTS[index][3]
+        self.category = engine.move_category(species, index)
+
+    @property
+    def current_pp(self):
+        return int(self._engine.pp[self._key + (self._index,)])
+
+    def __repr__(self):
+        return f"{self.id} (move)"
+
+
+class SimPokemon:
+    """Read-only view of one team slot, shaped like poke_env's Pokemon"""
+
+    def __init__(self, engine, battle, side, slot):
+        self._engine, self._key = engine, (battle, side, slot)
+        self.slot = slot
+        species = engine.species[battle, side, slot]
+        self.species_id = int(engine.species_ids[species])
+        self.species = engine.species_names[species]
+        self.type_1 = SIM_TYPES[engine.type_1[species]]
+        self.type_2 = SIM_TYPES[engine.type_2[species]] if engine.type_2[species] >= 0 else None
+        self.base_stats = dict(zip(('hp', 'atk', 'def', 'spa', 'spd', 'spe'),
+                                   engine.base_stats[species].tolist()))
+        self.moves = {
+            move.id: move for move in
+            (engine.move_view(battle, side, slot, index) for index in range(MOVE_ACTIONS))
+        }
+
+    @property
+    def current_hp(self):
+        return int(np.ceil(self._engine.hp[self._key]))
+
+    @property
+    def max_hp(self):
+        return int(self._engine.max_hp[self._key])
+
+    @property
+    def current_hp_fraction(self):
+        return float(self._engine.hp[self._key] / self._engine.max_hp[self._key])
+
+    @property
+    def fainted(self):
+        return self._engine.hp[self._key] <= 0
+
+    @property
+    def active(self):
+        battle, side, slot = self._key
+        return self._engine.active[battle, side] == slot
+
+    def __repr__(self):
+        return f"{self.species} (pokemon)"
+
+
+class SimBattle:
+    """One side's view of an offline battle, shaped like poke_env's Battle"""
+
+    def __init__(self, engine, battle, side):
+        self._engine = engine
+        self._battle, self._side = battle, side
+        self.battle_tag = f"offline-{engine.generation}-{battle}"
+        self.battle_format = engine.battle_format
+        self.gen = OFFLINE_GEN
+        self.player_role = f"p{side + 1}"
+        self.weather = {}
+        self.can_mega_evolve = self.can_z_move = self.can_dynamax = self.can_tera = False
+
+    def _pokemon(self, side, slot):
+        return self._engine.pokemon_view(self._battle, side, slot)
+
+    @property
+    def turn(self):
+        return int(self._engine.turn[self._battle])
+
+    @property
+    def active_pokemon(self):
+        return self._pokemon(self._side, self._engine.active[self._battle, self._side])
+
+    @property
+    def opponent_active_pokemon(self):
+        other = 1 - self._side
+        return self._pokemon(other, self._engine.active[self._battle, other])
+
+    @property
+    def team(self):
+        return {f"{self.player_role}: {pokemon.species}": pokemon
+                for pokemon in (self._pokemon(self._side, slot) for slot in range(6))}
+
+    @property
+    def opponent_team(self):
+        other = 1 - self._side
+        seen = np.flatnonzero(self._engine.seen[self._battle, other])
+        return {f"p{other + 1}: {pokemon.species}": pokemon
+                for pokemon in (self._pokemon(other, slot) for slot in seen)}
+
+    @property
+    def force_switch(self):
+        return bool(self._engine.force_switch[self._battle, self._side])
+
+    @property
+    def available_moves(self):
+        engine, b, side = self._engine, self._battle, self._side
+        if engine.force_switch[b, side]:
+            return []
+        slot = engine.active[b, side]
+        return [engine.move_view(b, side, slot, index) for index in range(MOVE_ACTIONS)
+                if engine.pp[b, side, slot, index] > 0]
+
+    @property
+    def available_switches(self):
+        engine, b, side = self._engine, self._battle, self._side
+        alive = engine.hp[b, side] > 0
+        alive[engine.active[b, side]] = False
+        return [self._pokemon(side, slot) for slot in np.flatnonzero(alive)]
+
+    @property
+    def finished(self):
+        return bool(self._engine.done[self._battle])
+
+    @property
+    def won(self):
+        if not self.finished:
+            return None
+        return bool(self._engine.winner[self._battle] == self._side)
+
+    @property
+    def lost(self):
+        won = self.won
+        return None if won is None else not won
+
+
+class OfflineBattleEngine:
+    """
+    In-process, simplified singles battles on pokemon.csv stats.
+
+    Every battle's state lives in (battle, side, slot) arrays and step()
+    resolves a turn of all battles at once with NumPy: switches, then moves in
+    priority/speed order with type effectiveness, STAB, accuracy and damage
+    rolls. SimBattle views expose the attributes the existing Player
+    subclasses read, so their choose_move(battle) runs unchanged via play().
+    Each species gets four fixed moves: two STAB attacks, a priority hit and
+    a heal.
+    """
+
+    def __init__(self, pokemon_csv=POKEMON_CSV, level=50, max_turns=200, seed=None,
+                 battle_format="gen9offlinesingles"):
+        self.level = level
+        self.max_turns = max_turns
+        self.rng = np.random.default_rng(seed)
+        self.battle_format = SimFormat(battle_format, TYPE_CHART)
+        self.generation = 0
+        self._load_species(pokemon_csv)
+        self.reset(0)
+
+    def _load_species(self, pokemon_csv):
+        species = pd.read_csv(pokemon_csv)
+        self.species_ids = species['#'].to_numpy()
+        self.species_names = species['Name'].str.lower().tolist()
+        self.type_1 = species['Type 1'].str.upper().map(TYPE_INDEX).to_numpy()
+        self.type_2 = species['Type 2'].str.upper().map(TYPE_INDEX).fillna(-1).astype(int).to_numpy()
+        self.base_stats = species[['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']].to_numpy()
+        self.id_to_row = np.full(self.species_ids.max() + 1, -1)
+        self.id_to_row[self.species_ids] = np.arange(self.species_ids.size)
+
+        # Level-scaled stats (perfect IVs, no EVs, neutral nature)
+        base = self.base_stats.astype(np.float64)
+        self.stats = np.floor((2 * base + 31) * self.level / 100) + 5
+        self.stats[:, 0] = np.floor((2 * base[:, 0] + 31) * self.level / 100) + self.level + 10
+
+        normal = TYPE_INDEX['NORMAL']
+        n = self.species_ids.size
+        mono = self.type_2 < 0
+        self.move_types = np.column_stack([
+            self.type_1, np.where(mono, normal, self.type_2), np.full(n, normal), np.full(n, normal)])
+        self.move_power = np.tile([slot[0] for slot in MOVE_SLOTS], (n, 1))
+        self.move_power[mono, 1] = 70
+        self.physical = base[:, 1] >= base[:, 3]
+        self.move_ids = [
+            [f"{TYPE_NAMES[self.move_types[row, index]].lower()}{kind}{self.move_power[row, index]}"
+             for index, kind in enumerate(('strike', 'strike', 'quick', 'recover'))]
+            for row in range(n)
+        ]
+
+    def move_category(self, species, index):
+        if index == 3:
+            return STATUS
+        return PHYSICAL if self.physical[species] else SPECIAL
+
+    def reset(self, n_battles, teams=None):
+        """Start n_battles fresh battles; teams is (battles, 2, 6) species ids or random"""
+        self.generation += 1
+        if teams is None:
+            species = self._random_teams(n_battles)
+        else:
+            species = self.id_to_row[np.asarray(teams)]
+            if (species < 0).any():
+                raise ValueError("Unknown species id in teams")
+
+        self.n_battles = n_battles
+        self.species = species
+        self.max_hp = self.stats[species, 0]
+        self.hp = self.max_hp.copy()
+        self.pp = np.broadcast_to(np.array([slot[3] for slot in MOVE_SLOTS]),
+                                  species.shape + (MOVE_ACTIONS,)).copy()
+        self.active = np.zeros((n_battles, 2), dtype=np.int64)
+        self.seen = np.zeros((n_battles, 2, 6), dtype=bool)
+        self.seen[:, :, 0] = True
+        self.force_switch = np.zeros((n_battles, 2), dtype=bool)
+        self.done = np.zeros(n_battles, dtype=bool)
+        self.winner = np.full(n_battles, -1)
+        self.turn = np.zeros(n_battles, dtype=np.int64)
+        self._views = {}
+        return self
+
+    def _random_teams(self, n_battles):
+        """Six distinct species per side, resampling duplicates until none are left"""
+        n = self.species_ids.size
+        teams = self.rng.integers(0, n, size=(n_battles * 2, 6))
+        while True:
+            ordered = np.sort(teams, axis=1)
+            clash = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not clash.any():
+                return teams.reshape(n_battles, 2, 6)
+            teams[clash] = self.rng.integers(0, n, size=(clash.sum(), 6))
+
+    def battle(self, battle, side):
+        return self._view(('battle', battle, side), lambda: SimBattle(self, battle, side))
+
+    def pokemon_view(self, battle, side, slot):
+        return self._view(('pokemon', battle, side, int(slot)),
+                          lambda: SimPokemon(self, battle, side, int(slot)))
+
+    def move_view(self, battle, side, slot, index):
+        return self._view(('move', battle, side, int(slot), index),
+                          lambda: SimMove(self, battle, side, int(slot), index))
+
+    def _view(self, key, factory):
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = factory()
+        return view
+
+    def pending(self):
+        """(battles, 2) mask of sides that must choose an action now"""
+        live = ~self.done[:, None]
+        forced = self.force_switch.any(axis=1, keepdims=True)
+        return live & np.where(forced, self.force_switch, True)
+
+    def order_to_action(self, order, battle, side):
+        """Translate a Player order (BattleOrder, move or pokemon view) into an action code"""
+        target = getattr(order, 'order', order)
+        if isinstance(target, SimMove):
+            return target._index
+        if isinstance(target, SimPokemon):
+            return SWITCH_OFFSET + target.slot
+        return self.default_action(battle, side)
+
+    def default_action(self, battle, side):
+        """First legal move, else first legal switch, else struggle"""
+        view = self.battle(battle, side)
+        moves = view.available_moves
+        if moves:
+            return moves[0]._index
+        switches = view.available_switches
+        if switches:
+            return SWITCH_OFFSET + switches[0].slot
+        return STRUGGLE
+
+    def random_option(self, battle, side):
+        """A uniformly random available move or switch view (None if there is none)"""
+        view = self.battle(battle, side)
+        options = view.available_moves + view.available_switches
+        return options[self.rng.integers(len(options))] if options else None
+
+    def step(self, actions):
+        """Resolve one turn for every battle; actions is (battles, 2), NO_ACTION where idle"""
+        actions = np.asarray(actions, dtype=np.int64)
+        acting = self.pending() & (actions != NO_ACTION)
+        b_idx = np.arange(self.n_battles)
+
+        # Switches go first (forced switches are the only action on those turns)
+        switching = acting & (actions >= SWITCH_OFFSET) & (actions < STRUGGLE)
+        target = np.clip(actions - SWITCH_OFFSET, 0, 5)
+        legal = switching & (self.hp[b_idx[:, None], [[0, 1]], target] > 0)
+        self.active = np.where(legal, target, self.active)
+        rows, sides = np.nonzero(legal)
+        self.seen[rows, sides, target[rows, sides]] = True
+        resolving_forced = self.force_switch.any(axis=1)
+        self.force_switch &= ~legal
+
+        # Moves of both sides, computed against the opponent after switches
+        moving = acting & ((actions < MOVE_ACTIONS) | (actions == STRUGGLE)) & ~resolving_forced[:, None]
+        damage, heal, priority = self._move_effects(actions, moving)
+        speed = self.stats[self.species[b_idx[:, None], [[0, 1]], self.active], 5]
+        tiebreak = self.rng.random((self.n_battles, 2))
+        # Side 1 moves first on higher priority, then higher speed, then a coin flip
+        first = np.where(priority[:, 0] != priority[:, 1], priority[:, 1] > priority[:, 0],
+                         np.where(speed[:, 0] != speed[:, 1], speed[:, 1] > speed[:, 0],
+                                  tiebreak[:, 1] > tiebreak[:, 0])).astype(np.int64)
+
+        for order in (first, 1 - first):
+            attacker_alive = self.hp[b_idx, order, self.active[b_idx, order]] > 0
+            go = moving[b_idx, order] & attacker_alive & ~self.done
+            defender = 1 - order
+            self._apply(b_idx[go], defender[go], -damage[b_idx, order][go])
+            self._apply(b_idx[go], order[go], heal[b_idx, order][go])
+
+        self.turn += (acting.any(axis=1) & ~resolving_forced)
+        self._settle()
+        return self
+
+    def _move_effects(self, actions, moving):
+        """Damage dealt, HP healed and priority for every (battle, side) action"""
+        b_idx = np.arange(self.n_battles)[:, None]
+        sides = np.array([[0, 1]])
+        own = self.species[b_idx, sides, self.active]
+        foe = own[:, ::-1]
+        index = np.clip(actions, 0, MOVE_ACTIONS - 1)
+        struggle = actions == STRUGGLE
+
+        power = np.where(struggle, STRUGGLE_POWER, self.move_power[own, index]).astype(np.float64)
+        move_type = self.move_types[own, index]
+        accuracy = np.array([slot[1] for slot in MOVE_SLOTS])[index]
+        priority = np.where(moving & ~struggle, np.array([slot[2] for slot in MOVE_SLOTS])[index], 0)
+        status = (index == 3) & ~struggle
+
+        # Spend PP on the chosen move
+        rows, cols = np.nonzero(moving & ~struggle)
+        self.pp[rows, cols, self.active[rows, cols], index[rows, cols]] -= 1
+
+        physical = self.physical[own]
+        attack = np.where(physical, self.stats[own, 1], self.stats[own, 3])
+        defense = np.where(physical, self.stats[foe, 2], self.stats[foe, 4])
+        foe_type_2 = np.where(self.type_2[foe] >= 0, self.type_2[foe], self.type_1[foe])
+        effectiveness = effectiveness_table(TYPE_CHART)[move_type, self.type_1[foe], foe_type_2]
+        effectiveness = np.where(struggle, 1.0, effectiveness)
+        stab = np.where(~struggle & ((move_type == self.type_1[own]) | (move_type == self.type_2[own])),
+                        1.5, 1.0)
+        roll = self.rng.uniform(0.85, 1.0, size=actions.shape)
+        hit = self.rng.random(actions.shape) < accuracy
+
+        base = (2 * self.level / 5 + 2) * power * attack / defense / 50 + 2
+        damage = np.floor(base * stab * effectiveness * roll) * hit
+        damage = np.where(moving & ~status, damage, 0.0)
+        heal = np.where(moving & status, HEAL_FRACTION * self.max_hp[b_idx, sides, self.active], 0.0)
+        return damage, heal, priority
+
+    def _apply(self, battles, sides, delta):
+        slots = self.active[battles, sides]
+        hp = self.hp[battles, sides, slots] + delta
+        self.hp[battles, sides, slots] = np.clip(hp, 0, self.max_hp[battles, sides, slots])
+
+    def _settle(self):
+        """Faints force switches; a side with nothing left loses; long battles go to HP"""
+        live = ~self.done
+        b_idx = np.arange(self.n_battles)[:, None]
+        fainted = (self.hp[b_idx, [[0, 1]], self.active] <= 0) & live[:, None]
+        remaining = (self.hp > 0).sum(axis=2)
+
+        # Ties (both sides wiped out in the same turn, or equal HP at the turn
+        # limit) go to a coin flip so neither seat is favoured
+        out = (remaining == 0) & live[:, None]
+        finished = out.any(axis=1)
+        self.winner[finished] = self._decide(out[finished, 1], out[finished, 0])
+        self.done |= finished
+        self.force_switch = fainted & ~self.done[:, None]
+
+        timed_out = ~self.done & (self.turn >= self.max_turns)
+        if timed_out.any():
+            share = (self.hp / self.max_hp).sum(axis=2)[timed_out]
+            self.winner[timed_out] = self._decide(share[:, 0] > share[:, 1],
+                                                  share[:, 1] > share[:, 0])
+            self.done |= timed_out
+
+    def _decide(self, side_0_wins, side_1_wins):
+        """1 where only side 1 won, 0 where only side 0 won, a fair coin otherwise"""
+        tie = side_0_wins == side_1_wins
+        return np.where(tie, self.rng.integers(0, 2, size=tie.size), np.where(side_1_wins, 1, 0))
+
+    def attach(self, player):
+        """Route a Player's choose_random_move fallback to the engine"""
+        player.choose_random_move = self._choose_random_move
+        return player
+
+    def decide(self, player, battle, side):
+        """Ask an attached Player for its order in one battle and return the action code"""
+        order = player.choose_move(self.battle(battle, side))
+        return self.order_to_action(order, battle, side)
+
+    def _choose_random_move(self, battle):
+        return self.random_option(battle._battle, battle._side)
+
+    def play(self, player_1, player_2, n_battles, teams=None):
+        """
+        Run n_battles between two Player instances through their choose_move.
+
+        Players should be created with start_listening=False. For the run,
+        their choose_random_move fallback is routed to the engine's own random
+        choice, since poke_env's version only accepts its Battle class; the
+        players' own fallback is restored afterwards.
+        """
+        players = (player_1, player_2)
+        saved = [vars(player).get('choose_random_move') for player in players]
+        for player in players:
+            self.attach(player)
+
+        try:
+            self.reset(n_battles, teams)
+            actions = np.full((n_battles, 2), NO_ACTION)
+            while not self.done.all():
+                actions.fill(NO_ACTION)
+                for battle, side in zip(*np.nonzero(self.pending())):
+                    actions[battle, side] = self.decide(players[side], battle, side)
+                self.step(actions)
+        finally:
+            for player, original in zip(players, saved):
+                if original is None:
+                    vars(player).pop('choose_random_move', None)
+                else:
+                    player.choose_random_move = original
+
+        wins = np.bincount(self.winner, minlength=2)
+        return OfflineResult(wins, self.winner.copy(), self.turn.copy())
+
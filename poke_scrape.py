@@ -2,33 +2,30 @@
 import requests
 from bs4 import BeautifulSoup
 
+from feature_pipeline import validation_report
+from usage_ingest import PIKALYTICS_URL, UsageIngestor, tera_summary
 
-def scrape_tera_usage_data():
+
+def scrape_tera_usage_data(base_url=PIKALYTICS_URL, battle_format="gen9ou", **ingest_kwargs):
     """
     Scrape current Tera type usage from competitive sites
     """
-    base_url = "https://www.pikalytics.com/pokedex/gen9ou"
+    # Pooled, cached and concurrent fetching lives in usage_ingest
+    ingestor = UsageIngestor(base_url, battle_format, **ingest_kwargs)
 
-    # Implementation would depend on site structure
     # Return DataFrame with pokemon names and tera usage stats
-    pass
+    return tera_summary(ingestor.ingest())
 
 
 def validate_pokemon_data(df):
     """
     Quality checks for Pokemon dataset
     """
-    # Check for missing values in critical fields
+    # Check for missing values in critical fields and validate BST calculations
     critical_fields = ["name", "bst", "type1", "tera_usage_rate"]
-    missing_data = df[critical_fields].isnull().sum()
-
-    # Validate BST calculations
-    calculated_bst = df[
-        ["hp", "attack", "defense", "sp_attack", "sp_defense", "speed"]
-    ].sum(axis=1)
-    bst_mismatch = (df["bst"] != calculated_bst).sum()
+    missing_data, bst_mismatch = validation_report(df, critical_fields)
 
     print(f"Missing data: {missing_data}")
     print(f"BST calculation mismatches: {bst_mismatch}")
 
-    return df.dropna(subset=critical_fields)
+    return df.dropna(subset=[field for field in critical_fields if field in df.columns])
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+from rl_bot import RLPlayer
+
+LATENCY_WINDOW = 10000
+
+
+class BatchedPolicyServer:
+    """
+    Batch policy inference for many concurrent RL battles.
+
+    Battles await predict(obs); a background task collects pending
+    observations until max_batch_size are waiting or max_wait_ms has passed
+    since the first one, runs one model.predict over the stacked batch and
+    resolves every waiting battle with its action. With use_executor=True the
+    forward pass runs off the event loop so websocket traffic keeps flowing.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2.0, deterministic=True,
+                 use_executor=False):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.deterministic = deterministic
+        self.use_executor = use_executor
+
+        self._queue = None
+        self._task = None
+        self._buffer = None
+        # Requests taken off the queue for the batch being collected or run
+        self._in_flight = []
+
+        self.requests = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._started_at = None
+
+    async def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._started_at = time.perf_counter()
+            self._task = asyncio.get_running_loop().create_task(self._serve())
+        return self
+
+    async def stop(self):
+        """Stop serving; battles still waiting for an action get a RuntimeError"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+            waiting, self._in_flight = self._in_flight, []
+            while not self._queue.empty():
+                waiting.append(self._queue.get_nowait())
+            for _, future, _ in waiting:
+                if not future.done():
+                    future.set_exception(RuntimeError("BatchedPolicyServer stopped"))
+
+    async def predict(self, observation):
+        """Action for one observation, computed as part of the next batch"""
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(observation, dtype=np.float32), future,
+                               time.perf_counter()))
+        return await future
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._in_flight = pending = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._stack([observation for observation, _, _ in pending])
+            try:
+                if self.use_executor:
+                    actions = await loop.run_in_executor(None, self._forward, batch)
+                else:
+                    actions = self._forward(batch)
+            except Exception as error:
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            now = time.perf_counter()
+            for action, (_, future, queued_at) in zip(actions, pending):
+                if not future.done():
+                    future.set_result(int(action))
+                self.latencies.append(now - queued_at)
+            self.requests += len(pending)
+            self.batches += 1
+            self.batch_sizes.append(len(pending))
+
+    def _stack(self, observations):
+        """Copy observations into a reused (max_batch_size, obs_dim) buffer"""
+        shape = observations[0].shape
+        if self._buffer is None or self._buffer.shape[1:] != shape:
+            self._buffer = np.empty((self.max_batch_size,) + shape, dtype=np.float32)
+        batch = self._buffer[:len(observations)]
+        for row, observation in zip(batch, observations):
+            row[...] = observation
+        return batch
+
+    def _forward(self, batch):
+        actions, _ = self.model.predict(batch, deterministic=self.deterministic)
+        return np.atleast_1d(actions)
+
+    def stats(self):
+        """Requests, batching and latency (ms) summary since start()"""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        latencies = np.array(self.latencies) * 1000.0
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+            "requests_per_second": self.requests / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class BatchedRLPlayer(RLPlayer):
+    """RLPlayer whose turns go through a shared BatchedPolicyServer"""
+
+    def __init__(self, *args, policy_server, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.policy_server = policy_server
+
+    async def choose_move(self, battle):
+        # A fresh buffer per request: it waits in the queue until the batch runs
+        action = await self.policy_server.predict(self.embed_battle(battle))
+        return self.action_to_move(action, battle)
@@ -1,10 +1,8 @@
-from poke_env.player import RandomPlayer
-from poke_env.environment import AbstractBattle
-from poke_env import PlayerConfiguration
-from stable_baselines3 import PPO
-from stable_baselines3.common.env_util import make_vec_env
+from poke_env.player import Player
 import numpy as np
-from gym import spaces
+from gymnasium import spaces
+
+from battle_encoder import OBSERVATION_SIZE, BattleEncoder
 
 
 class RLPlayer(Player):
@@ -18,61 +16,17 @@ class RLPlayer(Player):
             22
         )  # 4 moves + 6 switches + 12 mega/z moves
         self.observation_space = spaces.Box(
-            low=-1, high=1, shape=(100,), dtype=np.float32
+            low=-1, high=1, shape=(OBSERVATION_SIZE,), dtype=np.float32
         )
+        self.encoder = BattleEncoder()
 
-    def embed_battle(self, battle):
-        """Convert battle state to numerical vector"""
-        # Initialize observation vector
-        obs = np.zeros(100)
-
-        # Active Pokemon stats (normalized)
-        if battle.active_pokemon:
-            obs[0] = battle.active_pokemon.current_hp_fraction
-            obs[12] = battle.active_pokemon.base_stats["atk"] / 200.0
-            obs[13] = battle.active_pokemon.base_stats["def"] / 200.0
-            obs[14] = battle.active_pokemon.base_stats["spa"] / 200.0
-            obs[15] = battle.active_pokemon.base_stats["spd"] / 200.0
-            obs[2] = battle.active_pokemon.base_stats["spe"] / 200.0
-
-        # Opponent Pokemon stats
-        if battle.opponent_active_pokemon:
-            obs[16] = battle.opponent_active_pokemon.current_hp_fraction
-            obs[17] = battle.opponent_active_pokemon.base_stats["atk"] / 200.0
-            obs[18] = battle.opponent_active_pokemon.base_stats["def"] / 200.0
-            obs[19] = battle.opponent_active_pokemon.base_stats["spa"] / 200.0
-            obs[20] = battle.opponent_active_pokemon.base_stats["spd"] / 200.0
-            obs[21] = battle.opponent_active_pokemon.base_stats["spe"] / 200.0
-
-        # Available moves encoding
-        for i, move in enumerate(battle.available_moves[:4]):
-            if move.base_power:
-                obs[12 + i] = move.base_power / 150.0
-            obs[16 + i] = move.accuracy / 100.0 if move.accuracy else 1.0
-            obs[20 + i] = move.pp / move.max_pp if move.max_pp else 0
-
-        # Team health status
-        for i, pokemon in enumerate(battle.team.values()):
-            if i < 6:
-                obs[24 + i] = pokemon.current_hp_fraction
-
-        # Opponent team info (what we know)
-        for i, pokemon in enumerate(battle.opponent_team.values()):
-            if i < 6:
-                obs[30 + i] = (
-                    pokemon.current_hp_fraction if pokemon.current_hp_fraction else 1.0
-                )
-
-        # Weather and field conditions
-        weather_conditions = ["raindance", "sunnyday", "sandstorm", "hail"]
-        for i, weather in enumerate(weather_conditions):
-            obs[36 + i] = 1.0 if battle.weather == weather else 0.0
-
-        return obs
+    def embed_battle(self, battle, out=None):
+        """Convert battle state to numerical vector (layout in battle_encoder)"""
+        return self.encoder.encode(battle, out)
 
     def compute_reward(self, battle):
         """Compute reward based on battle outcome and state"""
-        if battle.battle_tag:
+        if battle.finished:
             # Battle ended
             if battle.won:
                 return 1.0
@@ -108,7 +62,7 @@ class RLPlayer(Player):
 
         # Actions 4-9: switch Pokemon
         switch_action = action - 4
-        if switch_action < len(battle.available_switches):
+        if 0 <= switch_action < len(battle.available_switches):
             return self.create_order(battle.available_switches[switch_action])
 
         # Fallback
@@ -116,19 +70,18 @@ class RLPlayer(Player):
 
 
 # Training setup
-def train_rl_bot():
-    # Create training environment
-    training_player = RLPlayer()
-    opponent = RandomPlayer()
+def train_rl_bot(total_timesteps=10000, n_envs=4, **kwargs):
+    """Train with PPO on parallel offline battles (see rl_training.train_vectorized)"""
+    from rl_training import train_vectorized
 
-    # Create and train model
-    model = PPO("MlpPolicy", training_player, verbose=1)
-    model.learn(total_timesteps=10000)
+    model, _ = train_vectorized(total_timesteps=total_timesteps, n_envs=n_envs, **kwargs)
 
-    # Save the trained model
-    training_player.model = model
-    return training_player
+    # Attach the trained policy to a player that can battle on a server
+    trained_player = RLPlayer()
+    trained_player.model = model
+    return trained_player
 
 
 # Usage
-trained_bot = train_rl_bot()
+if __name__ == "__main__":
+    trained_bot = train_rl_bot()
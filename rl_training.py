@@ -0,0 +1,154 @@
+import time
+from pathlib import Path
+
+import gymnasium as gym
+import numpy as np
+from poke_env.player import RandomPlayer
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback, CallbackList, CheckpointCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+from heuristic_poke_bot import SmartHeuristicPlayer
+from max_dmg_bot import MaxDamagePlayer
+from offline_battle import NO_ACTION, OfflineBattleEngine
+from rl_bot import RLPlayer
+
+OPPONENTS = {
+    "random": RandomPlayer,
+    "max_damage": MaxDamagePlayer,
+    "smart": SmartHeuristicPlayer,
+}
+DEFAULT_OPPONENT_POOL = ("random", "max_damage", "smart")
+
+
+class OfflineBattleEnv(gym.Env):
+    """
+    One RLPlayer battle per episode against an opponent drawn from a pool.
+
+    Battles run on the in-process OfflineBattleEngine, so each environment
+    (and each SubprocVecEnv worker) needs no Showdown server. The RLPlayer's
+    own embed_battle, compute_reward and action_to_move define the MDP.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self, opponent_pool=DEFAULT_OPPONENT_POOL, opponent_weights=None, seed=None):
+        super().__init__()
+        self.engine = OfflineBattleEngine(seed=seed)
+        self.agent = self.engine.attach(RLPlayer(start_listening=False))
+        self.observation_space = self.agent.observation_space
+        self.action_space = self.agent.action_space
+
+        self.opponent_names = list(opponent_pool)
+        self.opponents = [self.engine.attach(OPPONENTS[name](start_listening=False))
+                          for name in self.opponent_names]
+        weights = np.ones(len(self.opponents)) if opponent_weights is None else np.asarray(opponent_weights, dtype=np.float64)
+        self.opponent_weights = weights / weights.sum()
+        self.opponent = None
+        self._actions = np.full((1, 2), NO_ACTION)
+        self._obs = np.zeros(self.observation_space.shape, dtype=np.float32)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        if seed is not None:
+            self.engine.rng = np.random.default_rng(seed)
+        choice = self.np_random.choice(len(self.opponents), p=self.opponent_weights)
+        self.opponent = self.opponents[choice]
+        self.engine.reset(1)
+        self._advance_opponent()
+        return self._observation(), {"opponent": self.opponent_names[choice]}
+
+    def step(self, action):
+        view = self.engine.battle(0, 0)
+        order = self.agent.action_to_move(int(action), view)
+        self._actions.fill(NO_ACTION)
+        self._actions[0, 0] = self.engine.order_to_action(order, 0, 0)
+        if self.engine.pending()[0, 1]:
+            self._actions[0, 1] = self.engine.decide(self.opponent, 0, 1)
+        self.engine.step(self._actions)
+        self._advance_opponent()
+
+        terminated = bool(self.engine.done[0])
+        reward = float(self.agent.compute_reward(view))
+        info = {"won": view.won} if terminated else {}
+        return self._observation(), reward, terminated, False, info
+
+    def _advance_opponent(self):
+        """Play out turns where only the opponent has to act (its forced switches)"""
+        pending = self.engine.pending()
+        while not self.engine.done[0] and pending[0, 1] and not pending[0, 0]:
+            self._actions.fill(NO_ACTION)
+            self._actions[0, 1] = self.engine.decide(self.opponent, 0, 1)
+            self.engine.step(self._actions)
+            pending = self.engine.pending()
+
+    def _observation(self):
+        # Encoded into a reused buffer, but handed out as a copy: DummyVecEnv
+        # keeps terminal_observation (and callers keep reset observations) by reference
+        return self.agent.embed_battle(self.engine.battle(0, 0), self._obs).copy()
+
+
+class ThroughputCallback(BaseCallback):
+    """Log environment steps per second across all parallel environments"""
+
+    def __init__(self, log_every=2048, verbose=0):
+        super().__init__(verbose)
+        self.log_every = log_every
+        self.history = []
+        self._last_time = None
+        self._last_steps = 0
+
+    def _on_training_start(self):
+        self._last_time = time.perf_counter()
+        self._last_steps = self.num_timesteps
+
+    def _on_step(self):
+        if self.num_timesteps - self._last_steps >= self.log_every:
+            now = time.perf_counter()
+            rate = (self.num_timesteps - self._last_steps) / (now - self._last_time)
+            self.history.append((self.num_timesteps, rate))
+            self.logger.record("time/steps_per_second", rate)
+            if self.verbose:
+                print(f"{self.num_timesteps} steps: {rate:.0f} steps/s")
+            self._last_time, self._last_steps = now, self.num_timesteps
+        return True
+
+
+def make_training_env(n_envs=4, opponent_pool=DEFAULT_OPPONENT_POOL, opponent_weights=None,
+                      subprocess=True, seed=None):
+    """N parallel OfflineBattleEnvs; observations come back batched as (n_envs, 100)"""
+    return make_vec_env(
+        OfflineBattleEnv,
+        n_envs=n_envs,
+        seed=seed,
+        env_kwargs={"opponent_pool": opponent_pool, "opponent_weights": opponent_weights},
+        vec_env_cls=SubprocVecEnv if subprocess and n_envs > 1 else DummyVecEnv,
+    )
+
+
+def train_vectorized(total_timesteps=10000, n_envs=4, opponent_pool=DEFAULT_OPPONENT_POOL,
+                     opponent_weights=None, subprocess=True, checkpoint_dir="checkpoints",
+                     checkpoint_every=50000, seed=None, verbose=1, **ppo_kwargs):
+    """
+    Train PPO on n_envs parallel battles.
+
+    Checkpoints are written every checkpoint_every environment steps (summed
+    over all environments) and the final model is saved as final.zip.
+    Returns (model, throughput callback).
+    """
+    env = make_training_env(n_envs, opponent_pool, opponent_weights, subprocess, seed)
+    throughput = ThroughputCallback(log_every=max(n_envs, 2048), verbose=verbose)
+    callbacks = [throughput]
+    if checkpoint_dir is not None:
+        callbacks.append(CheckpointCallback(save_freq=max(checkpoint_every // n_envs, 1),
+                                            save_path=checkpoint_dir, name_prefix="rl_player"))
+
+    try:
+        model = PPO("MlpPolicy", env, verbose=verbose, seed=seed, **ppo_kwargs)
+        model.learn(total_timesteps=total_timesteps, callback=CallbackList(callbacks))
+        if checkpoint_dir is not None:
+            model.save(Path(checkpoint_dir) / "final")
+    finally:
+        env.close()
+    return model, throughput
@@ -1,11 +1,11 @@
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import pearsonr, chi2_contingency
-from sklearn.preprocessing import StandardScaler
-from dython.nominal import associations
-import plotly.express as px
+
+import feature_pipeline
+from feature_pipeline import load_features
+from mixed_associations import AssociationEngine
 
 required_fields = [
     # Base Statistics
@@ -17,41 +17,35 @@ required_fields = [
     # Competitive Metrics
     'usage_rate', 'win_rate', 'tier',
     # Derived Features
-    'is_offensive' (attack + sp_attack > 140),
-    'is_fast' (speed > 100),
-    'is_bulky' (hp + defense + sp_defense > 200)
+    'is_offensive',  # attack + sp_attack > 140
+    'is_fast',       # speed > 100
+    'is_bulky',      # hp + defense + sp_defense > 200
 ]
 
+# Plotting libraries are imported inside the functions that draw, so loading
+# the data and features does not pay for matplotlib/seaborn/plotly
+
 # Load and merge datasets
-def load_pokemon_data():
-    # Base stats from Kaggle
-    base_df = pd.read_csv('pokemon_base_stats.csv')
+def load_pokemon_data(usage_csv='competitive_usage.csv', tera_csv='tera_usage_data.csv'):
+    # Base stats + engineered features from All_Pokemon.csv (cached, see feature_pipeline)
+    pokemon_df = load_features()
     
-    # Competitive usage from Pikalytics/Smogon
-    usage_df = pd.read_csv('competitive_usage.csv') 
-    
-    # Tera type data (you'll need to scrape/compile this)
-    tera_df = pd.read_csv('tera_usage_data.csv')
-    
-    # Merge datasets
-    pokemon_df = base_df.merge(usage_df, on='name', how='left')
-    pokemon_df = pokemon_df.merge(tera_df, on='name', how='left')
+    # Competitive usage from Pikalytics/Smogon and Tera type data, when available
+    for path in (usage_csv, tera_csv):
+        if Path(path).exists():
+            pokemon_df = pokemon_df.merge(pd.read_csv(path), on='name', how='left')
     
     return pokemon_df
 
 # Create derived features
 def engineer_features(df):
-    df['bst'] = df[['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed']].sum(axis=1)
-    df['has_4x_weakness'] = df.apply(check_4x_weakness, axis=1)  # Custom function
-    df['offensive_stat'] = df[['attack', 'sp_attack']].max(axis=1)
-    df['defensive_stat'] = df[['defense', 'sp_defense']].mean(axis=1)
-    
-    return df
+    # Vectorized; 4x weaknesses come from the Against <Type> columns
+    return feature_pipeline.engineer_features(df)
 
 # Handle both categorical and numerical variables
 def create_comprehensive_correlation_matrix(df):
     """
-    Uses dython library to handle mixed data types
+    Mixed-type association matrix (see mixed_associations.AssociationEngine)
     - Pearson's r for numeric-numeric
     - Cramér's V for categorical-categorical  
     - Correlation ratio for categorical-numeric
@@ -61,16 +55,18 @@ def create_comprehensive_correlation_matrix(df):
     numerical_cols = ['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed', 'bst']
     categorical_cols = ['type1', 'type2', 'primary_tera_type', 'has_4x_weakness']
     
-    # Create correlation matrix
-    corr_matrix = associations(df[numerical_cols + categorical_cols], 
-                              nominal_columns=categorical_cols,
-                              figsize=(12, 10),
-                              title='Pokemon Features Correlation Matrix')
+    # Create correlation matrix (labeled DataFrame, no plotting)
+    engine = AssociationEngine(df[numerical_cols + categorical_cols],
+                               nominal_columns=categorical_cols)
+    corr_matrix = engine.compute().to_frame()
     
     return corr_matrix
 
 # Pairplot for numeric relationships
 def explore_numeric_relationships(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     numeric_features = ['bst', 'speed', 'offensive_stat', 'tera_usage_rate', 'stab_tera_percentage']
     
     # Pairplot with regression lines
@@ -82,6 +78,9 @@ def explore_numeric_relationships(df):
 
 # Categorical analysis
 def analyze_categorical_relationships(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # BST categories vs Tera type preferences  
     df['bst_category'] = pd.cut(df['bst'], bins=[0, 500, 550, 600, 800], 
                                labels=['Low', 'Mid', 'High', 'Very High'])
@@ -95,6 +94,8 @@ def analyze_categorical_relationships(df):
 
     # Interactive correlation heatmap
 def create_interactive_correlation_matrix(df):
+    import plotly.express as px
+
     # Compute correlation matrix
     corr = df.select_dtypes(include=[np.number]).corr()
     
@@ -109,6 +110,9 @@ def create_interactive_correlation_matrix(df):
 
 # Clustered correlation matrix  
 def create_clustered_heatmap(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Compute correlation and cluster
     corr = df.select_dtypes(include=[np.number]).corr()
     
@@ -123,7 +127,11 @@ def create_clustered_heatmap(df):
     g.fig.suptitle('Clustered Pokemon Features Correlation Matrix', y=0.98)
     plt.show()
 
-    def test_bst_stab_correlation(df):
+def test_bst_stab_correlation(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from scipy.stats import pearsonr
+
     # Filter out Pokemon with 4x weaknesses to isolate BST effect
     no_4x_df = df[df['has_4x_weakness'] == False]
     
@@ -145,6 +153,8 @@ def create_clustered_heatmap(df):
     return correlation, p_value
 
 def analyze_offensive_stats_tera_preference(df):
+    import matplotlib.pyplot as plt
+
     # Create offensive capability metric
     df['offensive_capability'] = df[['attack', 'sp_attack']].max(axis=1) + df['speed'] * 0.5
     
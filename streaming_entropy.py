@@ -0,0 +1,189 @@
+from collections import namedtuple
+
+import numpy as np
+
+from systemic_entropy import SystemicEntropyModel
+
+MetaSnapshot = namedtuple('MetaSnapshot', ['matches', 'H', 'VCI', 'N_eff', 'B'])
+
+
+class StreamingEntropyEstimator:
+    """
+    Incremental H(p*), VCI, N_eff and B for a live match feed.
+
+    Every observation is a (strategy id, score) pair - for match results the
+    winner scores 1 and the loser 0. Per strategy we keep a usage weight plus
+    Welford mean / M2 accumulators, so state is O(strategies) and any tick is
+    answered without rescanning history:
+    - p* is the usage weight share of each strategy
+    - viability is the running mean score of each strategy
+    - VCI compares the viability variance at a reference point with now
+
+    Windows:
+    - window=W keeps only the last W observations (sliding, exact downdates)
+    - decay=λ forgets each older observation by a factor λ (exponential)
+    """
+
+    def __init__(self, n_strategies, window=None, decay=None,
+                 counterplay_index=1.0, reference_viabilities=None):
+        if window is not None and decay is not None:
+            raise ValueError("use either a sliding window or a decay factor, not both")
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError("decay must be in (0, 1]")
+
+        self.n_strategies = n_strategies
+        self.window = window
+        self.decay = decay
+        self.counterplay_index = counterplay_index
+        self.entropy_model = SystemicEntropyModel()
+
+        # Welford accumulators per strategy (weights are float for decay)
+        self.weights = np.zeros(n_strategies)
+        self.means = np.zeros(n_strategies)
+        self.m2 = np.zeros(n_strategies)
+        self.n_matches = 0
+
+        # Sliding windows need the raw observations to undo them later
+        if window is not None:
+            self._ring_ids = np.zeros(window, dtype=np.int64)
+            self._ring_scores = np.zeros(window)
+            self._ring_start = 0
+            self._ring_size = 0
+
+        self.reference_variance = None
+        if reference_viabilities is not None:
+            self.reference_variance = np.var(reference_viabilities)
+
+    def update(self, strategy_ids, scores):
+        """Add one observation or a micro-batch of (strategy, score) pairs"""
+        strategy_ids = np.atleast_1d(np.asarray(strategy_ids, dtype=np.int64))
+        scores = np.atleast_1d(np.asarray(scores, dtype=np.float64))
+        if strategy_ids.shape != scores.shape:
+            raise ValueError("strategy_ids and scores must have the same shape")
+        if strategy_ids.size == 0:
+            return self
+
+        if self.window is not None:
+            # Only the newest `window` observations of an oversized batch survive
+            strategy_ids = strategy_ids[-self.window:]
+            scores = scores[-self.window:]
+            overflow = self._ring_size + strategy_ids.size - self.window
+            if overflow > 0:
+                self._evict(overflow)
+            self._push(strategy_ids, scores)
+        elif self.decay is not None:
+            # Older mass fades by λ per new observation; M2 scales with the weights.
+            # Observations inside one micro-batch share the same weight.
+            fade = self.decay ** strategy_ids.size
+            self.weights *= fade
+            self.m2 *= fade
+
+        self._merge(*self._batch_moments(strategy_ids, scores), sign=1)
+        return self
+
+    def update_matches(self, winners, losers):
+        """Add match results: winners score 1, losers score 0"""
+        winners = np.atleast_1d(np.asarray(winners, dtype=np.int64))
+        losers = np.atleast_1d(np.asarray(losers, dtype=np.int64))
+        self.n_matches += winners.size
+        return self.update(np.concatenate([winners, losers]),
+                           np.concatenate([np.ones(winners.size), np.zeros(losers.size)]))
+
+    def mark_reference(self):
+        """Use the current viability spread as the 'before' side of VCI"""
+        self.reference_variance = np.var(self.viabilities())
+        return self.reference_variance
+
+    def strategy_distribution(self):
+        """Current p* estimate (usage share)"""
+        total = self.weights.sum()
+        if total <= 0:
+            return np.zeros(self.n_strategies)
+        return self.weights / total
+
+    def viabilities(self):
+        """Running mean score of every strategy seen in the window"""
+        return self.means[self.weights > 0]
+
+    def score_variances(self):
+        """Per-strategy score variance from the Welford accumulators"""
+        seen = self.weights > 0
+        variances = np.zeros(self.n_strategies)
+        variances[seen] = self.m2[seen] / self.weights[seen]
+        return variances
+
+    def entropy(self):
+        return self.entropy_model.calculate_strategic_entropy_batch(
+            self.strategy_distribution())
+
+    def effective_strategies(self):
+        """N_eff = exp(H)"""
+        return np.exp(self.entropy())
+
+    def viability_compression_index(self):
+        """Var[reference] / Var[now]; nan until a reference is marked"""
+        if self.reference_variance is None:
+            return np.nan
+        var_after = np.var(self.viabilities())
+        return self.reference_variance / var_after if var_after > 0 else np.inf
+
+    def tick(self, counterplay_index=None, alpha=0.4, beta=0.4, gamma=0.2):
+        """Snapshot of every metric for the current window"""
+        if counterplay_index is None:
+            counterplay_index = self.counterplay_index
+        H = self.entropy()
+        VCI = self.viability_compression_index()
+        B = self.entropy_model.calculate_boringness_metric_batch(
+            H, VCI, counterplay_index, alpha=alpha, beta=beta, gamma=gamma)
+        return MetaSnapshot(self.n_matches, float(H), float(VCI),
+                            float(np.exp(H)), float(B))
+
+    def _batch_moments(self, strategy_ids, scores):
+        counts = np.bincount(strategy_ids, minlength=self.n_strategies).astype(np.float64)
+        sums = np.bincount(strategy_ids, weights=scores, minlength=self.n_strategies)
+        seen = counts > 0
+        means = np.zeros(self.n_strategies)
+        means[seen] = sums[seen] / counts[seen]
+        deviations = scores - means[strategy_ids]
+        m2 = np.bincount(strategy_ids, weights=deviations ** 2, minlength=self.n_strategies)
+        return counts, means, m2
+
+    def _merge(self, counts, means, m2, sign):
+        """Chan et al. parallel Welford merge (sign=1) or exact removal (sign=-1)"""
+        touched = counts > 0
+        n_a = self.weights[touched]
+        mean_a = self.means[touched]
+        n_b = counts[touched]
+        mean_b = means[touched]
+
+        if sign > 0:
+            n = n_a + n_b
+            delta = mean_b - mean_a
+            self.means[touched] = mean_a + delta * n_b / n
+            self.m2[touched] += m2[touched] + delta ** 2 * n_a * n_b / n
+            self.weights[touched] = n
+            return
+
+        # Removing batch b from the combined accumulator a
+        n = n_a - n_b
+        emptied = n <= 0
+        safe_n = np.where(emptied, 1.0, n)
+        new_mean = np.where(emptied, 0.0, (n_a * mean_a - n_b * mean_b) / safe_n)
+        delta = mean_b - new_mean
+        new_m2 = self.m2[touched] - m2[touched] - delta ** 2 * n * n_b / np.where(emptied, 1.0, n_a)
+        self.means[touched] = new_mean
+        self.m2[touched] = np.where(emptied, 0.0, np.maximum(new_m2, 0.0))
+        self.weights[touched] = np.where(emptied, 0.0, n)
+
+    def _push(self, strategy_ids, scores):
+        positions = (self._ring_start + self._ring_size + np.arange(strategy_ids.size)) % self.window
+        self._ring_ids[positions] = strategy_ids
+        self._ring_scores[positions] = scores
+        self._ring_size += strategy_ids.size
+
+    def _evict(self, n_old):
+        positions = (self._ring_start + np.arange(n_old)) % self.window
+        self._merge(*self._batch_moments(self._ring_ids[positions],
+                                         self._ring_scores[positions]), sign=-1)
+        self._ring_start = (self._ring_start + n_old) % self.window
+        self._ring_size -= n_old
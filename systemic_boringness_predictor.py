@@ -1,28 +1,89 @@
-class BoringnessPredictor:
-    def __init__(self, entropy_threshold=2.1, vci_threshold=2.5, counterplay_threshold=0.4):
+import numpy as np
+
+from intervention_scheduler import InterventionScheduler
+from systemic_entropy import SystemicEntropyModel
+
+
+# (alpha, beta, gamma) of B = α·(1/H) + β·VCI + γ·(1/C)
+DEFAULT_WEIGHTS = (0.4, 0.4, 0.2)
+
+
+class BoringnessPredictor(SystemicEntropyModel):
+    def __init__(self, entropy_threshold=2.1, vci_threshold=2.5, counterplay_threshold=0.4,
+                 intervention_threshold=0.7, weights=DEFAULT_WEIGHTS):
+        super().__init__()
         self.entropy_threshold = entropy_threshold
         self.vci_threshold = vci_threshold
         self.counterplay_threshold = counterplay_threshold
-        
+        self.intervention_threshold = intervention_threshold
+        self.alpha, self.beta, self.gamma = weights
+
     def predict_long_term_boringness(self, system_trajectory):
         """Predict when system becomes 'boring' (low entropy, high compression)"""
-        boringness_scores = []
-        
-        for time_point in system_trajectory:
-            H = self.calculate_strategic_entropy(time_point['strategy_distribution'])
-            VCI = self.calculate_viability_compression_index(
-                time_point['viabilities_before'], time_point['viabilities_after'])
-            C = time_point['counterplay_index']
-            
-            B = 0.4 * (1/H) + 0.4 * VCI + 0.2 * (1/C)
-            boringness_scores.append(B)
-            
-        return np.array(boringness_scores)
-    
-    def identify_intervention_points(self, boringness_trajectory):
-        """Identify when external intervention is needed"""
-        critical_points = []
-        for i, score in enumerate(boringness_trajectory):
-            if score > 0.7:  # Critical boringness threshold
-                critical_points.append(i)
-        return critical_points
+        if len(system_trajectory) == 0:
+            return np.array([])
+
+        # Stack the per-time-point dicts once and score them in a single pass;
+        # strategy counts may change over time, so rows are NaN-padded
+        _, _, boringness_scores = self.score_trajectory(
+            _pad_rows([time_point['strategy_distribution'] for time_point in system_trajectory]),
+            _pad_rows([time_point['viabilities_before'] for time_point in system_trajectory]),
+            _pad_rows([time_point['viabilities_after'] for time_point in system_trajectory]),
+            [time_point['counterplay_index'] for time_point in system_trajectory])
+        return boringness_scores
+
+    def score_trajectory(self, strategy_distributions, viabilities_before,
+                         viabilities_after, counterplay_index,
+                         alpha=None, beta=None, gamma=None):
+        """Vectorized H, VCI and B for a whole trajectory
+
+        strategy_distributions is (time, strategies) and the viability arrays
+        are (time, strategies); counterplay_index is a (time,) vector. Extra
+        leading axes (e.g. metas × time × strategies) broadcast through.
+        Weights left as None use the predictor's own.
+        """
+        alpha = self.alpha if alpha is None else alpha
+        beta = self.beta if beta is None else beta
+        gamma = self.gamma if gamma is None else gamma
+        H = self.calculate_strategic_entropy_batch(strategy_distributions)
+        VCI = self.calculate_viability_compression_index_batch(
+            viabilities_before, viabilities_after)
+        B = self.calculate_boringness_metric_batch(
+            H, VCI, counterplay_index, alpha=alpha, beta=beta, gamma=gamma)
+        return H, VCI, B
+
+    def boring_regime(self, H, VCI, counterplay_index):
+        """Mask of points past all three thresholds: low entropy, high compression, low counterplay"""
+        return ((np.asarray(H) < self.entropy_threshold)
+                & (np.asarray(VCI) > self.vci_threshold)
+                & (np.asarray(counterplay_index) < self.counterplay_threshold))
+
+    def identify_intervention_points(self, boringness_trajectory, threshold=None, cost=1.0,
+                                     window=10, budget=None):
+        """Identify when external intervention is needed
+
+        Scores above the critical threshold (the predictor's
+        intervention_threshold unless given) accumulate their excess until an
+        intervention resets the meta for `window` steps; returns the
+        minimum-cost intervention steps (one list per row for a batch).
+        """
+        if threshold is None:
+            threshold = self.intervention_threshold
+        scheduler = InterventionScheduler(cost, window, threshold, budget)
+        schedules = scheduler.plan(boringness_trajectory)
+        if isinstance(schedules, list):
+            return [schedule.times.tolist() for schedule in schedules]
+        return schedules.times.tolist()
+
+
+def _pad_rows(rows):
+    """(time, strategies) array of per-time-point vectors, NaN where a row is shorter
+
+    The batch entropy treats NaN as zero probability and the batch VCI
+    ignores NaN viabilities, so padding leaves every row's score unchanged.
+    """
+    rows = [np.asarray(row, dtype=np.float64).ravel() for row in rows]
+    padded = np.full((len(rows), max(row.size for row in rows)), np.nan)
+    for i, row in enumerate(rows):
+        padded[i, :row.size] = row
+    return padded
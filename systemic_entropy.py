@@ -1,8 +1,4 @@
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-import matplotlib.pyplot as plt
 
 class SystemicEntropyModel:
     def __init__(self):
@@ -25,3 +21,35 @@ class SystemicEntropyModel:
                                   alpha=0.4, beta=0.4, gamma=0.2):
         """B = α·(1/H) + β·VCI + γ·(1/C)"""
         return alpha * (1/H_entropy) + beta * VCI + gamma * (1/counterplay_index)
+
+    def calculate_strategic_entropy_batch(self, strategy_distributions):
+        """H(p*) along the last axis of a (..., strategies) array"""
+        p = np.asarray(strategy_distributions, dtype=np.float64)
+        positive = p > 0
+        # 0 * log(0) is taken as 0, same as dropping zeros in the scalar version
+        log_p = np.log(np.where(positive, p, 1.0))
+        return -np.sum(np.where(positive, p * log_p, 0.0), axis=-1)
+
+    def calculate_viability_compression_index_batch(self, viabilities_before, viabilities_after,
+                                                    variance_floor=0.0):
+        """VCI along the last axis, ignoring nan (unobserved) viabilities
+
+        Var[after] is raised to at least variance_floor; with the default 0
+        the result is np.inf wherever Var[after] is zero.
+        """
+        var_before = np.nanvar(np.asarray(viabilities_before, dtype=np.float64), axis=-1)
+        var_after = np.nanvar(np.asarray(viabilities_after, dtype=np.float64), axis=-1)
+        var_after = np.maximum(var_after, variance_floor)
+        compressed = var_after > 0
+        return np.where(compressed,
+                        var_before / np.where(compressed, var_after, 1.0),
+                        np.inf)
+
+    def calculate_boringness_metric_batch(self, H_entropy, VCI, counterplay_index,
+                                          alpha=0.4, beta=0.4, gamma=0.2):
+        """Broadcasting B; zero H or C gives np.inf instead of a warning"""
+        H_entropy = np.asarray(H_entropy, dtype=np.float64)
+        counterplay_index = np.asarray(counterplay_index, dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            return (alpha * np.reciprocal(H_entropy) + beta * np.asarray(VCI)
+                    + gamma * np.reciprocal(counterplay_index))
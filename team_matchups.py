@@ -0,0 +1,137 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from battle_log import (DATA_DIR, TEAM_FIRST_WON, TEAM_SECOND_WON, load_team_combats,
+                        load_team_rosters)
+from matchup_matrix import MatchupMatrix
+from systemic_entropy import SystemicEntropyModel
+
+POKEMON_CSV = DATA_DIR / 'pokemon_battle' / 'pokemon.csv'
+STAT_COLUMNS = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+
+
+class TeamMatchupEngine:
+    """
+    Team-level matchups from team_combat.csv joined with the six-species rosters.
+
+    Team stat vectors come from one gather into an id-indexed species stat
+    table, team outcomes feed a MatchupMatrix (so team p*, entropy and VCI use
+    the same equilibrium code as species), and a species -> teams inverted
+    index answers "which species drive dominance" without DataFrame filters.
+    """
+
+    def __init__(self, team_ids, rosters, stat_table, first, second, first_won):
+        self.team_ids = np.asarray(team_ids, dtype=np.int64)
+        self.rosters = np.asarray(rosters, dtype=np.int64)
+        self.stat_table = np.asarray(stat_table, dtype=np.float64)
+        self.entropy_model = SystemicEntropyModel()
+
+        # Team id -> roster row; outcomes are stored in row space
+        self.team_row = np.full(self.team_ids.max() + 1, -1, dtype=np.int64)
+        self.team_row[self.team_ids] = np.arange(self.team_ids.size)
+        first = self.team_row[np.asarray(first, dtype=np.int64)]
+        second = self.team_row[np.asarray(second, dtype=np.int64)]
+        winner = np.where(np.asarray(first_won, dtype=bool), first, second)
+        # A team playing itself says nothing about matchups and would count as a game won
+        distinct = first != second
+        first, second, winner = first[distinct], second[distinct], winner[distinct]
+        self.matchups = MatchupMatrix.from_outcomes(
+            first, second, winner, n_strategies=self.team_ids.size, id_offset=0)
+
+    @classmethod
+    def from_data(cls, cache_dir=None):
+        """Load rosters, team combats and pokemon.csv stats from data/pokemon_battle"""
+        rosters = load_team_rosters(cache_dir)
+        combats = load_team_combats(cache_dir)
+        slots = np.column_stack([rosters[str(slot)] for slot in range(6)])
+
+        species = pd.read_csv(POKEMON_CSV, usecols=['#'] + STAT_COLUMNS)
+        ids = species['#'].to_numpy()
+        stat_table = np.zeros((ids.max() + 1, len(STAT_COLUMNS)))
+        stat_table[ids] = species[STAT_COLUMNS].to_numpy()
+
+        first, second = np.asarray(combats['first']), np.asarray(combats['second'])
+        return cls(rosters['#'], slots, stat_table, first, second,
+                   _first_won(np.asarray(combats['winner'])))
+
+    @cached_property
+    def member_stats(self):
+        """(teams, 6, stats) stats of every roster slot, one fancy-index gather"""
+        return self.stat_table[self.rosters]
+
+    @cached_property
+    def team_stats(self):
+        """(teams, stats) summed base stats per team"""
+        return self.member_stats.sum(axis=1)
+
+    @cached_property
+    def equilibrium(self):
+        """Team-level p*"""
+        return self.matchups.solve_equilibrium()
+
+    def team_entropy(self):
+        return self.entropy_model.calculate_strategic_entropy(self.equilibrium)
+
+    def team_vci(self):
+        """
+        Var[win rate vs the whole field] / Var[win chance vs p*].
+
+        How much the equilibrium compresses the spread of team viability.
+        """
+        observed = self.matchups.observed
+        before = self.matchups.win_rates()[observed]
+        after = 0.5 + 0.5 * (self.matchups.payoff @ self.equilibrium)[observed]
+        return self.entropy_model.calculate_viability_compression_index(before, after)
+
+    @cached_property
+    def species_index(self):
+        """CSR-style inverted index: teams of species s are rows[indptr[s]:indptr[s + 1]]"""
+        flat = self.rosters.ravel()
+        order = np.argsort(flat, kind='stable')
+        rows = (order // self.rosters.shape[1])
+        counts = np.bincount(flat, minlength=self.stat_table.shape[0])
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return indptr, rows
+
+    def teams_with_species(self, species_id):
+        """Team ids whose roster contains the species (duplicates collapsed)"""
+        indptr, rows = self.species_index
+        if not 0 <= species_id < indptr.size - 1:
+            return np.array([], dtype=np.int64)
+        return self.team_ids[np.unique(rows[indptr[species_id]:indptr[species_id + 1]])]
+
+    def species_dominance(self, score='equilibrium', top=10):
+        """
+        Rank species by the mean score of the teams that field them.
+
+        score='equilibrium' uses team weight in p*; 'win_rate' uses the
+        empirical team win rate. Returns (species ids, scores, team counts).
+        """
+        if score == 'equilibrium':
+            team_scores = self.equilibrium
+        elif score == 'win_rate':
+            team_scores = np.nan_to_num(self.matchups.win_rates())
+        else:
+            raise ValueError(f"Unknown dominance score: {score}")
+
+        flat = self.rosters.ravel()
+        n_species = self.stat_table.shape[0]
+        counts = np.bincount(flat, minlength=n_species)
+        totals = np.bincount(flat, weights=np.repeat(team_scores, self.rosters.shape[1]),
+                             minlength=n_species)
+        fielded = np.flatnonzero(counts)
+        means = totals[fielded] / counts[fielded]
+
+        order = np.argsort(-means, kind='stable')[:top]
+        return fielded[order], means[order], counts[fielded[order]]
+
+
+def _first_won(winner):
+    """Decode team_combat.csv's side-coded winner column as a first-team-won mask"""
+    unexpected = (winner != TEAM_FIRST_WON) & (winner != TEAM_SECOND_WON)
+    if unexpected.any():
+        raise ValueError(f"team_combat.csv winner must be {TEAM_FIRST_WON} (first team) or "
+                         f"{TEAM_SECOND_WON} (second team); got {np.unique(winner[unexpected])[:5]}")
+    return winner == TEAM_FIRST_WON
@@ -0,0 +1,41 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+from poke_env.battle import Battle, Move, Pokemon
+
+# The modules live flat at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def make_battle():
+    return _make_battle
+
+
+def _make_battle(active, opponent, switches=()):
+    """
+    A real gen 9 poke_env Battle with real Move objects.
+
+    active and opponent are (species, move ids) pairs, switches are benched
+    species; everyone is at full HP and every move and switch is available.
+    """
+    battle = Battle('battle-gen9ou-1', 'tester', logging.getLogger('tests'), gen=9)
+    own = _pokemon(*active, is_active=True)
+    bench = [_pokemon(species) for species in switches]
+    battle._team = {f"p1: {pokemon.species}": pokemon for pokemon in [own] + bench}
+    foe = _pokemon(*opponent, is_active=True)
+    battle._opponent_team = {f"p2: {foe.species}": foe}
+    battle._available_moves = list(own.moves.values())
+    battle._available_switches = bench
+    return battle
+
+
+def _pokemon(species, moves=(), is_active=False):
+    pokemon = Pokemon(gen=9, species=species)
+    pokemon._max_hp = pokemon._current_hp = 100
+    pokemon._active = is_active
+    for move_id in moves:
+        pokemon._moves[move_id] = Move(move_id, gen=9)
+    return pokemon
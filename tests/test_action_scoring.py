@@ -0,0 +1,31 @@
+from action_scoring import ActionScorer, MAX_DAMAGE_WEIGHTS
+from heuristic_poke_bot import SmartHeuristicPlayer
+
+
+def test_smart_bot_attacks_super_effectively_instead_of_switching(make_battle):
+    # Ice Beam is 4x into Garchomp; Skarmory resists both of its known moves
+    battle = make_battle(('weavile', ('icebeam', 'knockoff')),
+                         ('garchomp', ('earthquake', 'dragonclaw')), switches=('skarmory',))
+    bot = SmartHeuristicPlayer(start_listening=False)
+    assert bot.action_scorer.choose(battle, bot.battle_memo(battle)).id == 'icebeam'
+
+
+def test_expected_damage_uses_zero_to_one_accuracy(make_battle):
+    battle = make_battle(('weavile', ('icebeam', 'iciclecrash')), ('garchomp', ()))
+    options, features = ActionScorer().encode(battle)
+    damage = dict(zip([move.id for move in options], features[:, 1]))
+    # 90 power · 4x · STAB 1.5, times 0.9 accuracy for Icicle Crash (85 power)
+    assert damage['icebeam'] == 540.0
+    assert damage['iciclecrash'] == 85 * 4 * 1.5 * 0.9
+
+
+def test_smart_bot_switches_out_of_useless_attacks(make_battle):
+    # Ground attacks cannot touch a Flying type; Skarmory walls its moves
+    battle = make_battle(('garchomp', ('earthquake',)), ('corviknight', ('bravebird', 'ironhead')),
+                         switches=('skarmory',))
+    assert ActionScorer().choose(battle).species == 'skarmory'
+
+
+def test_max_damage_never_switches_while_it_can_attack(make_battle):
+    battle = make_battle(('garchomp', ('earthquake',)), ('corviknight', ()), switches=('skarmory',))
+    assert ActionScorer(MAX_DAMAGE_WEIGHTS).choose(battle).id == 'earthquake'
@@ -0,0 +1,18 @@
+import numpy as np
+
+from battle_encoder import MOVE_ACCURACY, MOVE_POWER, MOVE_PP, OBSERVATION_SIZE, BattleEncoder
+
+
+def test_encodes_real_poke_env_moves(make_battle):
+    battle = make_battle(('weavile', ('icebeam', 'iciclecrash', 'swordsdance')), ('garchomp', ()))
+    battle.active_pokemon.moves['icebeam']._current_pp -= 4
+
+    out = np.full(OBSERVATION_SIZE, np.nan, dtype=np.float32)
+    encoded = BattleEncoder().encode(battle, out)
+
+    assert encoded is out
+    np.testing.assert_allclose(out[MOVE_POWER:MOVE_POWER + 3], [90 / 150, 85 / 150, 0.0])
+    # Accuracy goes in as poke_env's 0-1 chance; Swords Dance never misses
+    np.testing.assert_allclose(out[MOVE_ACCURACY:MOVE_ACCURACY + 3], [1.0, 0.9, 1.0])
+    np.testing.assert_allclose(out[MOVE_PP:MOVE_PP + 3], [12 / 16, 1.0, 1.0])
+    assert np.isfinite(out).all()
@@ -0,0 +1,18 @@
+import importlib
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = sorted(ROOT.glob('*.py'))
+
+
+@pytest.mark.parametrize('path', MODULES, ids=[path.stem for path in MODULES])
+def test_module_imports(path):
+    if path.stem.isidentifier():
+        importlib.import_module(path.stem)
+    else:
+        # Scripts such as stat-analysis-tera-9th.py are not importable by name
+        spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+        spec.loader.exec_module(importlib.util.module_from_spec(spec))
@@ -0,0 +1,73 @@
+import itertools
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from intervention_scheduler import InterventionScheduler
+
+
+def brute_force_cost(B, cost, window, threshold, budget):
+    excess = np.maximum(B - threshold, 0.0)
+    costs = np.broadcast_to(cost, B.shape)
+    most = B.size if budget is None else min(budget, B.size)
+    best = np.inf
+    for k in range(most + 1):
+        for times in itertools.combinations(range(B.size), k):
+            covered = np.zeros(B.size, dtype=bool)
+            for u in times:
+                covered[u:u + window] = True
+            best = min(best, excess[~covered].sum() + costs[list(times)].sum())
+    return best
+
+
+def realized_cost(schedule, B, cost, window, threshold):
+    covered = np.zeros(B.size, dtype=bool)
+    for u in schedule.times:
+        covered[u:u + window] = True
+    excess = np.maximum(B - threshold, 0.0)
+    return excess[~covered].sum() + np.broadcast_to(cost, B.shape)[schedule.times].sum()
+
+
+@pytest.mark.parametrize('budget', [None, 0, 1, 2])
+def test_plan_matches_brute_force(budget):
+    rng = np.random.default_rng(budget or 7)
+    for _ in range(60):
+        T, window = int(rng.integers(1, 9)), int(rng.integers(1, 4))
+        B = rng.uniform(0.0, 2.0, T)
+        cost = rng.uniform(0.1, 1.5, T) if rng.random() < 0.5 else float(rng.uniform(0.1, 1.5))
+        scheduler = InterventionScheduler(cost, window, 0.6, budget)
+        schedule = scheduler.plan(B)
+        expected = brute_force_cost(B, cost, window, 0.6, budget)
+
+        assert schedule.total_cost == pytest.approx(expected)
+        assert realized_cost(schedule, B, cost, window, 0.6) == pytest.approx(expected)
+        assert scheduler.optimal_cost(B)[0] == pytest.approx(expected)
+        if budget is not None:
+            assert len(schedule.times) <= budget
+
+
+def test_unbudgeted_plan_agrees_with_a_slack_budget():
+    # A budget above the useful level count takes the O(T) fixed-point path
+    B = np.random.default_rng(0).uniform(0.0, 1.5, (8, 400))
+    free = InterventionScheduler(0.8, 10, 0.6).plan(B)
+    tight = InterventionScheduler(0.8, 10, 0.6, budget=5).plan(B)
+    slack = InterventionScheduler(0.8, 10, 0.6, budget=10 ** 6).plan(B)
+    for a, b, c in zip(free, slack, tight):
+        assert a.total_cost == b.total_cost
+        assert len(c.times) <= 5 and c.total_cost >= a.total_cost
+
+
+def test_long_trajectory_plans_without_level_tables():
+    # ceil(T / window) level tables would need gigabytes here
+    B = np.random.default_rng(1).uniform(0.0, 1.5, 20_000)
+    scheduler = InterventionScheduler(1.0, 10, 0.6)
+    tracemalloc.start()
+    try:
+        schedule = scheduler.plan(B)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 32 * 2 ** 20
+    assert schedule.total_cost == pytest.approx(realized_cost(schedule, B, 1.0, 10, 0.6))
+    assert schedule.total_cost == pytest.approx(scheduler.optimal_cost(B)[0])
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import requests
+
+from usage_ingest import TERA_COLUMNS, FixtureServer, UsageIngestor
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'pikalytics'
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(FIXTURES) as server:
+        yield server
+
+
+def recording_session(statuses):
+    session = requests.Session()
+    session.hooks['response'].append(lambda response, *args, **kwargs:
+                                     statuses.append(response.status_code))
+    return session
+
+
+def test_ingest_builds_typed_tera_table(server, tmp_path):
+    table = UsageIngestor(server.url, cache_dir=tmp_path).ingest()
+
+    assert dict(table.dtypes.astype(str)) == TERA_COLUMNS
+    assert table['name'].tolist() == ['Great Tusk'] * 3 + ['Kingambit'] * 2
+    assert table['tera_type'].astype(str).tolist() == ['Steel', 'Water', 'Ground', 'Dark', 'Flying']
+    assert table['rank'].tolist() == [1, 2, 3, 1, 2]
+    np.testing.assert_allclose(table['usage_rate'], [31.52] * 3 + [27.08] * 2, rtol=1e-6)
+    np.testing.assert_allclose(table['tera_usage_rate'], [48.113, 21.53, 12.004, 55.25, 30.125],
+                               rtol=1e-6)
+
+
+def test_stale_cache_revalidates_with_etag(server, tmp_path):
+    statuses = []
+    first = UsageIngestor(server.url, cache_dir=tmp_path, ttl=0,
+                          session=recording_session(statuses)).ingest()
+    assert statuses == [200] * 3
+
+    statuses.clear()
+    second = UsageIngestor(server.url, cache_dir=tmp_path, ttl=0,
+                           session=recording_session(statuses)).ingest()
+    assert statuses == [304] * 3
+    assert second.equals(first)
+
+
+def test_fresh_cache_skips_requests(server, tmp_path):
+    UsageIngestor(server.url, cache_dir=tmp_path).ingest()
+    again = UsageIngestor(server.url, cache_dir=tmp_path)
+    again.ingest()
+    assert again.requests_made == 0
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from weight_sensitivity import WeightSensitivity
+
+STATISTICS = ('mean_boringness', 'boring_share', 'flip_rate', 'crossing_flip_rate')
+
+
+def assert_paths_agree(sensitivity, resolution):
+    grid = sensitivity.sweep(resolution=resolution)
+    dense = sensitivity.sweep(weights=grid.weights)
+    for name in STATISTICS:
+        np.testing.assert_allclose(getattr(grid, name), getattr(dense, name), rtol=0, atol=1e-12,
+                                   err_msg=name)
+    return grid, dense
+
+
+def test_threshold_tie_lands_on_the_same_side_on_both_paths():
+    # With weights (0.6, 0, 0.4), B = 0.6 / 2 + 0.4 / 1 = 0.7 exactly at every point
+    T = 50
+    sensitivity = WeightSensitivity(np.full((2, T), 2.0), np.linspace(0.0, 1.0, T),
+                                    np.ones((2, T)), threshold=0.7)
+    grid, dense = assert_paths_agree(sensitivity, resolution=10)
+
+    tied = np.flatnonzero(np.isclose(grid.weights, [0.6, 0.0, 0.4]).all(axis=1))[0]
+    assert grid.boring_share[tied] == dense.boring_share[tied] == 0.0
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_simplex_sweep_matches_dense_sweep(seed):
+    rng = np.random.default_rng(seed)
+    shape = (6, 40)
+    sensitivity = WeightSensitivity(rng.uniform(0.5, 3.0, shape), rng.uniform(0.0, 3.0, shape),
+                                    rng.uniform(0.2, 2.0, shape))
+    assert_paths_agree(sensitivity, resolution=25)
@@ -0,0 +1,204 @@
+import asyncio
+import csv
+import multiprocessing as mp
+import socket
+import subprocess
+import time
+from collections import namedtuple
+from itertools import combinations
+from pathlib import Path
+
+from poke_env import LocalhostServerConfiguration, ServerConfiguration
+
+MatchResult = namedtuple(
+    'MatchResult', ['player_1', 'player_2', 'wins_1', 'wins_2', 'battles', 'seconds', 'shard'])
+
+DEFAULT_FORMAT = "gen9randombattle"
+SERVER_STARTUP_TIMEOUT = 60
+
+
+class ResultsTable:
+    """Per-matchup results, optionally streamed to a CSV as they arrive"""
+
+    def __init__(self, path=None):
+        self.rows = []
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            with open(self.path, 'w', newline='') as f:
+                csv.writer(f).writerow(MatchResult._fields)
+
+    def add(self, result):
+        self.rows.append(result)
+        if self.path is not None:
+            with open(self.path, 'a', newline='') as f:
+                csv.writer(f).writerow(result)
+
+    def standings(self):
+        """name -> {'wins', 'battles', 'win_rate'}"""
+        table = {}
+        for row in self.rows:
+            for name, wins in ((row.player_1, row.wins_1), (row.player_2, row.wins_2)):
+                entry = table.setdefault(name, {"wins": 0, "battles": 0})
+                entry["wins"] += wins
+                entry["battles"] += row.battles
+        for entry in table.values():
+            entry["win_rate"] = entry["wins"] / entry["battles"] if entry["battles"] else 0
+        return table
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.rows, columns=MatchResult._fields)
+
+
+def round_robin_pairings(names):
+    return list(combinations(names, 2))
+
+
+def _make_player(spec, **player_kwargs):
+    """A bot spec is a Player subclass or a (Player subclass, kwargs) pair"""
+    if isinstance(spec, tuple):
+        cls, kwargs = spec
+        return cls(**{**player_kwargs, **kwargs})
+    return spec(**player_kwargs)
+
+
+async def play_round_robin(bots, pairings, n_battles=100, max_concurrent_battles=20,
+                           pairing_concurrency=10, battle_format=DEFAULT_FORMAT,
+                           server_configuration=None, on_result=None, shard=0):
+    """
+    Play every pairing concurrently in this event loop.
+
+    Each pairing gets fresh player instances (no shared battle counters) that
+    run up to pairing_concurrency battles at once; a semaphore keeps the total
+    number of live battles under max_concurrent_battles.
+    """
+    pairing_concurrency = max(1, min(pairing_concurrency, n_battles, max_concurrent_battles))
+    gate = asyncio.Semaphore(max(1, max_concurrent_battles // pairing_concurrency))
+    player_kwargs = {
+        "battle_format": battle_format,
+        "max_concurrent_battles": pairing_concurrency,
+        "server_configuration": server_configuration or LocalhostServerConfiguration,
+    }
+
+    async def play(name1, name2):
+        async with gate:
+            bot1 = _make_player(bots[name1], **player_kwargs)
+            bot2 = _make_player(bots[name2], **player_kwargs)
+            start = time.perf_counter()
+            await bot1.battle_against(bot2, n_battles=n_battles)
+            result = MatchResult(name1, name2, bot1.n_won_battles, bot2.n_won_battles,
+                                 n_battles, time.perf_counter() - start, shard)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return await asyncio.gather(*(play(name1, name2) for name1, name2 in pairings))
+
+
+def run_round_robin(bots, n_battles=100, max_concurrent_battles=20, pairing_concurrency=10,
+                    n_workers=1, showdown_path=None, base_port=8000,
+                    battle_format=DEFAULT_FORMAT, results_path=None, verbose=True):
+    """
+    Round robin over a bot zoo ({name: Player subclass or (subclass, kwargs)}).
+
+    With n_workers > 1 the pairings are sharded across worker processes, each
+    starting its own Showdown server from showdown_path on base_port + shard.
+    Finished matchups are streamed into the returned ResultsTable (and to
+    results_path as CSV) as soon as any worker reports them.
+    """
+    table = ResultsTable(results_path)
+
+    def record(result):
+        table.add(result)
+        if verbose:
+            print(f"{result.player_1} vs {result.player_2}: "
+                  f"{result.wins_1}-{result.wins_2} of {result.battles} "
+                  f"({result.seconds:.1f}s, shard {result.shard})")
+
+    pairings = round_robin_pairings(list(bots))
+    settings = dict(n_battles=n_battles, max_concurrent_battles=max_concurrent_battles,
+                    pairing_concurrency=pairing_concurrency, battle_format=battle_format)
+
+    if n_workers <= 1:
+        server = None
+        if showdown_path is not None:
+            server = _start_showdown(showdown_path, base_port)
+        try:
+            configuration = _server_configuration(base_port) if server else None
+            asyncio.run(play_round_robin(bots, pairings, server_configuration=configuration,
+                                         on_result=record, **settings))
+        finally:
+            if server is not None:
+                server.terminate()
+        return table
+
+    if showdown_path is None:
+        raise ValueError("Sharded tournaments need showdown_path to start one server per worker")
+
+    shards = [pairings[i::n_workers] for i in range(n_workers)]
+    shards = [shard for shard in shards if shard]
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    workers = [
+        ctx.Process(target=_run_shard,
+                    args=(i, bots, shard, settings, showdown_path, base_port + i, queue))
+        for i, shard in enumerate(shards)
+    ]
+    for worker in workers:
+        worker.start()
+
+    running, errors = len(workers), []
+    while running:
+        message = queue.get()
+        if isinstance(message, MatchResult):
+            record(message)
+        else:
+            # (shard, error or None) marks a worker as finished
+            running -= 1
+            if message[1] is not None:
+                errors.append(message)
+    for worker in workers:
+        worker.join()
+
+    if errors:
+        raise RuntimeError(f"Tournament shards failed: {errors}")
+    return table
+
+
+def _run_shard(shard, bots, pairings, settings, showdown_path, port, queue):
+    """Worker process: own Showdown server, own event loop, results via queue"""
+    server = None
+    try:
+        server = _start_showdown(showdown_path, port)
+        asyncio.run(play_round_robin(bots, pairings,
+                                     server_configuration=_server_configuration(port),
+                                     on_result=queue.put, shard=shard, **settings))
+        queue.put((shard, None))
+    except Exception as error:
+        queue.put((shard, repr(error)))
+    finally:
+        if server is not None:
+            server.terminate()
+
+
+def _server_configuration(port):
+    return ServerConfiguration(f"ws://localhost:{port}/showdown/websocket",
+                               LocalhostServerConfiguration.authentication_url)
+
+
+def _start_showdown(showdown_path, port):
+    """Start `node pokemon-showdown start --no-security <port>` and wait for the port"""
+    server = subprocess.Popen(
+        ["node", "pokemon-showdown", "start", "--no-security", str(port)],
+        cwd=showdown_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Showdown server on port {port} exited with {server.returncode}")
+        try:
+            with socket.create_connection(("localhost", port), timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise TimeoutError(f"Showdown server on port {port} did not start")
@@ -0,0 +1,84 @@
+import numpy as np
+
+# The 18 battle types, in poke_env's PokemonType order
+TYPE_NAMES = (
+    'BUG', 'DARK', 'DRAGON', 'ELECTRIC', 'FAIRY', 'FIGHTING', 'FIRE', 'FLYING', 'GHOST',
+    'GRASS', 'GROUND', 'ICE', 'NORMAL', 'POISON', 'PSYCHIC', 'ROCK', 'STEEL', 'WATER',
+)
+TYPE_INDEX = {name: i for i, name in enumerate(TYPE_NAMES)}
+
+# id(type_chart) -> (type_chart, table); the chart is kept alive so its id stays unique
+_TABLES = {}
+
+
+def effectiveness_table(type_chart):
+    """
+    18×18×18 attack type × defender type 1 × defender type 2 multipliers.
+
+    Built once per type chart (poke_env layout: chart[defender][attacker]).
+    Mono-type defenders live on the diagonal, i.e. table[a, d, d].
+    """
+    cached = _TABLES.get(id(type_chart))
+    if cached is not None and cached[0] is type_chart:
+        return cached[1]
+
+    n = len(TYPE_NAMES)
+    single = np.ones((n, n))
+    for d, defender in enumerate(TYPE_NAMES):
+        row = type_chart.get(defender, {})
+        for a, attacker in enumerate(TYPE_NAMES):
+            single[a, d] = row.get(attacker, 1.0)
+
+    table = single[:, :, None] * single[:, None, :]
+    diagonal = np.arange(n)
+    table[:, diagonal, diagonal] = single
+    table.setflags(write=False)
+
+    _TABLES[id(type_chart)] = (type_chart, table)
+    return table
+
+
+def battle_type_chart(battle):
+    """
+    Type chart of a battle: the one its format carries (the offline
+    simulator's), else poke_env's chart for the battle's generation.
+    """
+    type_chart = getattr(getattr(battle, 'battle_format', None), 'type_chart', None)
+    if type_chart is None:
+        type_chart = gen_type_chart(battle.gen)
+    return type_chart
+
+
+def gen_type_chart(gen):
+    """poke_env's type chart of a generation, the one source of type matchups"""
+    from poke_env.data import GenData
+
+    return GenData.from_gen(gen).type_chart
+
+
+def type_index(pokemon_type):
+    """Row of a PokemonType (or anything with a .name) in the table; -1 if not one of the 18"""
+    if pokemon_type is None:
+        return -1
+    return TYPE_INDEX.get(getattr(pokemon_type, 'name', str(pokemon_type)).upper(), -1)
+
+
+class BattleMemo:
+    """
+    Per-battle caches for the heuristic bots: the format's effectiveness
+    table and matchup scores by whatever key the caller picks (e.g. species
+    pair + known moves).
+    """
+
+    def __init__(self, type_chart):
+        self.type_chart = type_chart
+        self.table = effectiveness_table(type_chart)
+        self.matchups = {}
+
+    def multiplier(self, move_type, type_1, type_2):
+        """Table lookup, falling back to damage_multiplier for exotic types"""
+        a, d1 = type_index(move_type), type_index(type_1)
+        d2 = type_index(type_2) if type_2 is not None else d1
+        if a < 0 or d1 < 0 or d2 < 0:
+            return move_type.damage_multiplier(type_1, type_2, type_chart=self.type_chart)
+        return self.table[a, d1, d2]
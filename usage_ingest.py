@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from battle_log import CACHE_DIR
+from feature_pipeline import read_frame, write_frame
+
+PIKALYTICS_URL = "https://www.pikalytics.com"
+DEFAULT_FORMAT = "gen9ou"
+HTTP_CACHE_DIR = CACHE_DIR / 'http'
+DEFAULT_TTL = 24 * 3600
+USER_AGENT = "Equilibrium-Compression-Model usage ingest"
+
+# Pikalytics markup: species links on the format index, Tera entries on species pages
+INDEX_ENTRY = "a.pokedex_entry"
+INDEX_USAGE = "span.float-right"
+TERA_SECTION = "#dex_tera_wrapper"
+TERA_ENTRY = ".pokedex-move-entry-new"
+
+TERA_COLUMNS = {
+    'name': 'string',
+    'usage_rate': 'float32',
+    'tera_type': 'category',
+    'tera_usage_rate': 'float32',
+    'rank': 'int8',
+}
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache with a TTL and ETag / Last-Modified revalidation.
+
+    Each URL is stored as <sha1>.body plus <sha1>.json holding the validators
+    and fetch time. Entries younger than ttl are served without a request;
+    older ones are revalidated with a conditional GET.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def get(self, url):
+        """(body, meta) or (None, None) when the URL was never cached"""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            return body_path.read_bytes(), meta
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, None
+
+    def is_fresh(self, meta):
+        return meta is not None and time.time() - meta['fetched_at'] < self.ttl
+
+    def put(self, url, body, headers):
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        }
+        # Body first, then meta: a reader never sees meta without its body
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+        return meta
+
+    def touch(self, url, meta):
+        """Record a 304: the cached body is current again"""
+        meta = {**meta, 'fetched_at': time.time()}
+        _atomic_write(self._paths(url)[1], json.dumps(meta).encode())
+        return meta
+
+
+class UsageIngestor:
+    """
+    Tera type and usage ingestion from Pikalytics.
+
+    One pooled requests.Session serves a bounded thread pool, every response
+    goes through the ResponseCache, and the parsed pages become a typed long
+    table (one row per species × Tera type). Point base_url at a
+    FixtureServer to run everything offline.
+    """
+
+    def __init__(self, base_url=PIKALYTICS_URL, battle_format=DEFAULT_FORMAT,
+                 cache_dir=HTTP_CACHE_DIR, ttl=DEFAULT_TTL, max_workers=8, timeout=10.0,
+                 session=None):
+        self.base_url = base_url.rstrip('/')
+        self.battle_format = battle_format
+        self.cache = ResponseCache(cache_dir, ttl)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or self._make_session(max_workers)
+        self.requests_made = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_session(max_workers):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=2)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+
+    def index_url(self):
+        return f"{self.base_url}/pokedex/{self.battle_format}"
+
+    def species_url(self, name):
+        return f"{self.index_url()}/{quote(name)}"
+
+    def fetch(self, url):
+        """Body of url, from the cache when fresh or still valid"""
+        body, meta = self.cache.get(url)
+        if self.cache.is_fresh(meta):
+            return body
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        with self._lock:
+            self.requests_made += 1
+        if response.status_code == 304 and body is not None:
+            self.cache.touch(url, meta)
+            return body
+        response.raise_for_status()
+        self.cache.put(url, response.content, response.headers)
+        return response.content
+
+    def fetch_many(self, urls):
+        """Bodies in the order of urls, at most max_workers requests in flight"""
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            return list(pool.map(self.fetch, urls))
+
+    def species(self):
+        """(names, usage rates in %) listed on the format index page"""
+        return parse_index(self.fetch(self.index_url()))
+
+    def ingest(self, species=None, table_path=None):
+        """
+        Long Tera table for all (or the given) species of the format.
+
+        The result has TERA_COLUMNS dtypes; with table_path it is also saved
+        via feature_pipeline.write_frame (Parquet, Feather or pickle).
+        """
+        names, usage = self.species()
+        if species is not None:
+            wanted = set(species)
+            keep = [i for i, name in enumerate(names) if name in wanted]
+            names, usage = [names[i] for i in keep], [usage[i] for i in keep]
+
+        pages = self.fetch_many([self.species_url(name) for name in names])
+        rows = []
+        for name, usage_rate, page in zip(names, usage, pages):
+            for rank, (tera_type, rate) in enumerate(parse_tera_types(page), start=1):
+                rows.append((name, usage_rate, tera_type, rate, rank))
+        table = pd.DataFrame(rows, columns=list(TERA_COLUMNS)).astype(TERA_COLUMNS)
+        if table_path is not None:
+            write_frame(table, table_path)
+        return table
+
+
+def parse_index(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    names, usage = [], []
+    for entry in soup.select(INDEX_ENTRY):
+        name = entry.get('data-name') or entry.get_text(' ', strip=True)
+        rate = entry.select_one(INDEX_USAGE)
+        names.append(name)
+        usage.append(_percent(rate.get_text()) if rate else np.nan)
+    return names, usage
+
+
+def parse_tera_types(html):
+    """[(tera type, usage %)] from a species page, most used first"""
+    soup = BeautifulSoup(html, 'html.parser')
+    section = soup.select_one(TERA_SECTION)
+    if section is None:
+        return []
+    entries = []
+    for entry in section.select(TERA_ENTRY):
+        cells = [cell.get_text(strip=True) for cell in entry.find_all('div')]
+        cells = [cell for cell in cells if cell]
+        if len(cells) >= 2:
+            entries.append((cells[0], _percent(cells[-1])))
+    return sorted(entries, key=lambda entry: -entry[1])
+
+
+def tera_summary(table):
+    """One row per species: usage_rate, primary_tera_type, tera_usage_rate (as stat-analysis uses)"""
+    top = table[table['rank'] == 1]
+    return pd.DataFrame({
+        'name': top['name'].to_numpy(),
+        'usage_rate': top['usage_rate'].to_numpy(),
+        'primary_tera_type': top['tera_type'].astype(str).to_numpy(),
+        'tera_usage_rate': top['tera_usage_rate'].to_numpy(),
+    })
+
+
+def load_tera_table(table_path):
+    return read_frame(table_path)
+
+
+def _percent(text):
+    try:
+        return float(text.strip().rstrip('%'))
+    except ValueError:
+        return np.nan
+
+
+def _atomic_write(path, data):
+    scratch = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    scratch.write_bytes(data)
+    os.replace(scratch, path)
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Static pages with ETags; /a/b is served from a/b.html when that exists"""
+
+    def translate_path(self, path):
+        translated = super().translate_path(path).rstrip(os.sep)
+        if os.path.isfile(translated + '.html'):
+            return translated + '.html'
+        return translated
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return None
+            self._etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, '_etag', None)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self._etag = None
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Serve saved pages from a directory on localhost, for offline ingestion runs.
+
+    Lay pages out like the site: <root>/pokedex/gen9ou.html for the index and
+    <root>/pokedex/gen9ou/<Name>.html per species, then pass server.url as
+    UsageIngestor's base_url.
+    """
+
+    def __init__(self, directory, port=0):
+        handler = partial(_FixtureHandler, directory=str(directory))
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
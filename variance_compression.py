@@ -1,3 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+MIN_VARIANCE = 0.001  # Floor applied after every step
+PRESSURE_CACHE_SIZE = 16
+
+
 class VarianceCompressionModel:
     def __init__(self, right_wall_constraint, left_tail_pruning_rate):
         self.right_wall = right_wall_constraint
@@ -22,11 +31,34 @@ class VarianceCompressionModel:
             new_variance = min(pruned_variance, max_possible_variance)
             
             means.append(new_mean)
-            variances.append(max(new_variance, 0.001))  # Prevent zero variance
+            variances.append(max(new_variance, MIN_VARIANCE))  # Prevent zero variance
             
         return np.array(means), np.array(variances)
-    
-    def calculate_coevolution_pressure(self, time_step):
+
+    def solve_compression(self, initial_mean, initial_variance, time_steps):
+        """Closed-form equivalent of simulate_compression for long horizons"""
+        if not 0 <= self.pruning_rate <= 1:
+            # The min/floor unrolling below relies on 0 <= 1 - rate <= 1
+            return self.simulate_compression(initial_mean, initial_variance, time_steps)
+
+        means = initial_mean + cumulative_pressure(time_steps)
+        walls = np.maximum(0, self.right_wall - means) ** 2 / 4
+        variances = compressed_variances(initial_variance, walls, 1 - self.pruning_rate)
+        return means, variances
+
+    def find_crossover_step(self, initial_mean, initial_variance, time_steps):
+        """First step where the right wall, not pruning, bounds the variance (None if never)"""
+        if not 0 <= self.pruning_rate < 1:
+            return None  # Pruning alone sends the variance to the floor at step 1
+
+        means = initial_mean + cumulative_pressure(time_steps)
+        walls = np.maximum(0, self.right_wall - means) ** 2 / 4
+        envelope = _log_wall_envelope(initial_variance, walls, 1 - self.pruning_rate)
+        crossed = envelope[1:] < envelope[0]
+        return int(np.argmax(crossed)) + 1 if crossed.any() else None
+
+    @staticmethod
+    def calculate_coevolution_pressure(time_step):
         """Model how co-evolutionary arms race increases performance baseline"""
         return 0.02 * np.log(1 + time_step * 0.1)  # Diminishing returns
     
@@ -34,3 +66,131 @@ class VarianceCompressionModel:
         """Physical/design limitations create variance ceiling"""
         distance_to_wall = max(0, self.right_wall - current_mean)
         return (distance_to_wall ** 2) / 4  # Parabolic constraint
+
+
+class CompressionEnsemble:
+    """
+    Evolve N trajectories for each of P (right wall, pruning rate) pairs at once.
+
+    Results live in preallocated (param, run, time) arrays; means come from the
+    cached pressure table and variances from the closed-form recurrence, so no
+    step loop runs in Python. With noise_scale > 0 the co-evolutionary pressure gets
+    additive Gaussian noise; each parameter set draws from its own seeded stream,
+    so results do not depend on how the grid is chunked across processes.
+    """
+
+    def __init__(self, right_walls, pruning_rates, noise_scale=0.0, seed=None):
+        self.right_walls = np.atleast_1d(np.asarray(right_walls, dtype=np.float64))
+        self.pruning_rates = np.atleast_1d(np.asarray(pruning_rates, dtype=np.float64))
+        if self.right_walls.shape != self.pruning_rates.shape:
+            raise ValueError("right_walls and pruning_rates must pair up one-to-one")
+        self.noise_scale = noise_scale
+        self.seed = seed
+
+    @classmethod
+    def grid(cls, right_walls, pruning_rates, noise_scale=0.0, seed=None):
+        """Every combination of the given walls and rates (walls vary slowest)"""
+        walls, rates = np.meshgrid(right_walls, pruning_rates, indexing='ij')
+        return cls(walls.ravel(), rates.ravel(), noise_scale=noise_scale, seed=seed)
+
+    def simulate(self, initial_mean, initial_variance, time_steps, n_runs=1,
+                 n_workers=None, params_per_chunk=None):
+        """Return (means, variances), each shaped (param, run, time)"""
+        n_params = self.right_walls.size
+        baseline = cumulative_pressure(time_steps)
+        streams = np.random.SeedSequence(self.seed).spawn(n_params)
+
+        means = np.empty((n_params, n_runs, time_steps))
+        variances = np.empty((n_params, n_runs, time_steps))
+
+        if params_per_chunk is None:
+            params_per_chunk = max(1, -(-n_params // (n_workers or 1)))
+        chunks = [slice(start, min(start + params_per_chunk, n_params))
+                  for start in range(0, n_params, params_per_chunk)]
+        jobs = [(initial_mean, initial_variance, baseline, self.right_walls[chunk],
+                 self.pruning_rates[chunk], n_runs, self.noise_scale, streams[chunk])
+                for chunk in chunks]
+
+        if n_workers is None or n_workers <= 1 or len(chunks) == 1:
+            for chunk, job in zip(chunks, jobs):
+                means[chunk], variances[chunk] = _simulate_ensemble_chunk(*job)
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                for chunk, (chunk_means, chunk_variances) in zip(
+                        chunks, pool.map(_simulate_ensemble_chunk, *zip(*jobs))):
+                    means[chunk], variances[chunk] = chunk_means, chunk_variances
+
+        return means, variances
+
+
+def _simulate_ensemble_chunk(initial_mean, initial_variance, baseline, right_walls,
+                             pruning_rates, n_runs, noise_scale, streams):
+    """Worker for CompressionEnsemble: one block of parameter sets"""
+    n_params, time_steps = right_walls.size, baseline.size
+    means = np.empty((n_params, n_runs, time_steps))
+    means[:] = initial_mean + baseline
+
+    # Noise is drawn per parameter set from its own stream and accumulates in the mean
+    if noise_scale > 0:
+        for p, stream in enumerate(streams):
+            noise = noise_scale * np.random.default_rng(stream).standard_normal(
+                (n_runs, time_steps - 1))
+            means[p, :, 1:] += np.cumsum(noise, axis=-1)
+
+    walls = np.maximum(0, right_walls[:, None, None] - means) ** 2 / 4
+    keep = (1 - pruning_rates)[:, None, None]
+    variances = compressed_variances(initial_variance, walls, keep)
+    return means, variances
+
+
+@lru_cache(maxsize=PRESSURE_CACHE_SIZE)
+def cumulative_pressure(time_steps):
+    """
+    Mean offset from t=0 after each step, Σ_{s=1..t} pressure(s).
+
+    Pressure does not depend on the wall or pruning rate, so the table is
+    shared by every model and cached per horizon (read-only array).
+    """
+    pressure = VarianceCompressionModel.calculate_coevolution_pressure(
+        np.arange(time_steps, dtype=np.float64))
+    pressure[0] = 0.0
+    table = np.cumsum(pressure)
+    table.setflags(write=False)
+    return table
+
+
+def compressed_variances(initial_variance, walls, keep):
+    """
+    Solve v_t = max(min(v_{t-1}·keep, W_t), floor) without a Python loop.
+
+    Unrolling the min gives u_t = min_k c_k·keep^(t-k) with c_0 = v_0 and
+    c_k = W_k, i.e. keep^t times a running minimum of c_k·keep^-k; that is
+    evaluated in log space so million-step horizons don't overflow. u_t never
+    increases, so once it drops below the floor it stays there and the floor
+    can be applied afterwards. Works along the last axis for any leading
+    (param, run) shape; `keep` must lie in [0, 1].
+    """
+    walls = np.asarray(walls, dtype=np.float64)
+    keep = np.broadcast_to(np.asarray(keep, dtype=np.float64), walls.shape[:-1] + (1,))
+    # keep == 0 prunes everything to the floor after step 0; solve the rest with keep=1
+    pruned_out = keep == 0
+    safe_keep = np.where(pruned_out, 1.0, keep)
+
+    envelope = np.minimum.accumulate(
+        _log_wall_envelope(initial_variance, walls, safe_keep), axis=-1)
+    steps = np.arange(walls.shape[-1], dtype=np.float64)
+    variances = np.exp(steps * np.log(safe_keep) + envelope)
+    variances = np.where(pruned_out, 0.0, variances)
+
+    np.maximum(variances, MIN_VARIANCE, out=variances)
+    variances[..., 0] = initial_variance
+    return variances
+
+
+def _log_wall_envelope(initial_variance, walls, keep):
+    """log(c_k) - k·log(keep), the quantity whose running minimum drives the variance"""
+    steps = np.arange(walls.shape[-1], dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        log_c = np.log(walls)
+        log_c[..., 0] = np.log(initial_variance)
+    return log_c - steps * np.log(keep)
@@ -0,0 +1,230 @@
+from collections import namedtuple
+
+import numpy as np
+
+from intervention_scheduler import InterventionScheduler
+from systemic_boringness_predictor import DEFAULT_WEIGHTS, BoringnessPredictor
+
+# Boringness tensor (weights × trajectories × time) per sweep chunk
+SWEEP_CHUNK_BYTES = 64 * 2 ** 20
+# Stand-in for infinite 1/H, VCI or 1/C so that a zero weight still contributes zero
+FEATURE_CAP = 1e6
+# A point counts as above the threshold only past this margin (relative to its
+# largest feature), so B == threshold is decided alike on the dense and grid paths
+TIE_TOLERANCE = 1e-9
+
+SweepResult = namedtuple(
+    'SweepResult', ['weights', 'mean_boringness', 'boring_share', 'flip_rate', 'crossing_flip_rate'])
+
+
+def weight_simplex(resolution):
+    """Every (α, β, γ) on the simplex with step 1/resolution, ((r+1)(r+2)/2, 3)"""
+    alpha, beta = np.divmod(np.arange((resolution + 1) ** 2), resolution + 1)
+    keep = alpha + beta <= resolution
+    alpha, beta = alpha[keep], beta[keep]
+    return np.column_stack([alpha, beta, resolution - alpha - beta]) / resolution
+
+
+class WeightSensitivity:
+    """
+    How B = α·(1/H) + β·VCI + γ·(1/C) and its intervention points depend on the weights.
+
+    B is linear in the weights, so for features X = (1/H, VCI, 1/C) of a
+    batch of trajectories B(w) = X·w, and a sweep over W weight vectors is
+    one einsum 'wk,ntk->wnt' (run in chunks of about SWEEP_CHUNK_BYTES).
+    Sweeping the regular simplex grid skips the dense tensor altogether:
+    per grid row every point contributes one interval of weights, so a
+    million weight vectors cost O(rows · points). For every weight vector
+    the sweep reports the mean B, the share of points above the
+    intervention threshold, and how often a point's above-threshold status
+    (flip_rate) or an upward threshold crossing (crossing_flip_rate) differs
+    from the baseline weights. Both paths count a point as above once B
+    exceeds the threshold by more than TIE_TOLERANCE times its largest
+    feature, so ties at the threshold land on the same side either way.
+
+    The partial derivatives are analytic: ∂B/∂(α, β, γ) = X, independent of
+    the weights, and ∂B/∂(H, VCI, C) = (-α/H², β, -γ/C²).
+    """
+
+    def __init__(self, H, VCI, counterplay_index, threshold=0.7, baseline=DEFAULT_WEIGHTS):
+        H = np.atleast_2d(np.asarray(H, dtype=np.float64))
+        VCI = np.broadcast_to(np.asarray(VCI, dtype=np.float64), H.shape)
+        counterplay_index = np.broadcast_to(np.asarray(counterplay_index, dtype=np.float64), H.shape)
+        self.H, self.VCI, self.counterplay_index = H, VCI, counterplay_index
+        with np.errstate(divide='ignore'):
+            features = np.stack([np.reciprocal(H), VCI, np.reciprocal(counterplay_index)], axis=-1)
+        self.features = np.minimum(np.nan_to_num(features, posinf=FEATURE_CAP), FEATURE_CAP)
+        self.threshold = threshold
+        self.tolerance = TIE_TOLERANCE * np.maximum(np.abs(self.features).max(axis=-1), 1.0)
+        self.baseline = np.asarray(baseline, dtype=np.float64)
+
+    @classmethod
+    def from_trajectories(cls, strategy_distributions, viabilities_before, viabilities_after,
+                          counterplay_index, predictor=None, **kwargs):
+        """Features from (trajectories, time, strategies) arrays via BoringnessPredictor"""
+        predictor = predictor or BoringnessPredictor()
+        H, VCI, _ = predictor.score_trajectory(strategy_distributions, viabilities_before,
+                                               viabilities_after, counterplay_index)
+        kwargs.setdefault('threshold', predictor.intervention_threshold)
+        kwargs.setdefault('baseline', (predictor.alpha, predictor.beta, predictor.gamma))
+        return cls(H, VCI, counterplay_index, **kwargs)
+
+    def boringness(self, weights):
+        """B for (W, 3) weights: (W, trajectories, time)"""
+        return np.einsum('wk,ntk->wnt', np.atleast_2d(weights), self.features, optimize=True)
+
+    def sweep(self, weights=None, resolution=100):
+        """SweepResult over the given (W, 3) weights, or the simplex grid at resolution"""
+        if weights is None:
+            return self._sweep_simplex(resolution)
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        reference = self.above(self.boringness(self.baseline))[0]
+        reference_crossings = _upcrossings(reference)
+
+        n_weights = len(weights)
+        boring_share = np.empty(n_weights)
+        flip_rate = np.empty(n_weights)
+        crossing_flip_rate = np.empty(n_weights)
+        chunk = max(1, SWEEP_CHUNK_BYTES // (8 * reference.size))
+        for start in range(0, n_weights, chunk):
+            block = slice(start, start + chunk)
+            above = self.above(self.boringness(weights[block]))
+            boring_share[block] = above.mean(axis=(1, 2))
+            flip_rate[block] = (above != reference).mean(axis=(1, 2))
+            crossing_flip_rate[block] = (_upcrossings(above) != reference_crossings).mean(axis=(1, 2))
+        return SweepResult(weights, self._mean_boringness(weights), boring_share, flip_rate,
+                           crossing_flip_rate)
+
+    def _sweep_simplex(self, resolution):
+        """
+        SweepResult over weight_simplex(resolution) in O(resolution · points).
+
+        With w = (i, j, r - i - j) / r, a point is above the threshold (plus
+        its tolerance, folded into c) iff c + a·i + d·j > 0, so for every row
+        i the qualifying j form one interval, an upward crossing is the intersection of two intervals,
+        and all counts over the row come from a difference array.
+        """
+        r = resolution
+        X = self.features.reshape(-1, self.features.shape[-1])
+        shape = self.features.shape[:-1]
+        a = X[:, 0] - X[:, 2]
+        d = X[:, 1] - X[:, 2]
+        c = r * (X[:, 2] - self.threshold - self.tolerance.reshape(-1))
+
+        reference = self.above(self.boringness(self.baseline))[0].reshape(-1)
+        reference_crossings = _upcrossings(reference.reshape(shape)).reshape(-1)
+        # Flip count = (#reference points) + Σ sign·indicator, sign -1 where the reference is set
+        above_sign = np.where(reference, -1.0, 1.0)
+        crossing_sign = np.where(reference_crossings, -1.0, 1.0)
+        continues = (np.arange(X.shape[0]) % shape[-1]) > 0
+
+        above_count = np.empty((r + 1, r + 1))
+        flips = np.empty((r + 1, r + 1))
+        crossing_flips = np.empty((r + 1, r + 1))
+        chunk = max(1, SWEEP_CHUNK_BYTES // (64 * X.shape[0]))
+        for start in range(0, r + 1, chunk):
+            rows = np.arange(start, min(start + chunk, r + 1))
+            top = (r - rows)[:, None]
+            lo, hi = _above_interval(c + a * rows[:, None], d, top)
+            # The complement of a half-line anchored at 0 starts after it, else ends before it
+            below_lo = np.where(lo == 0, hi + 1, 0)
+            below_hi = np.minimum(np.where(lo == 0, top, lo - 1), top)
+            # Upward crossing: above now and below at the previous step of the same trajectory
+            cross_lo, cross_hi = lo.copy(), hi.copy()
+            cross_lo[:, 1:] = np.where(continues[1:], np.maximum(lo[:, 1:], below_lo[:, :-1]), lo[:, 1:])
+            cross_hi[:, 1:] = np.where(continues[1:], np.minimum(hi[:, 1:], below_hi[:, :-1]), hi[:, 1:])
+
+            above_count[rows] = _interval_counts(lo, hi, 1.0, r)
+            flips[rows] = reference.sum() + _interval_counts(lo, hi, above_sign, r)
+            crossing_flips[rows] = (reference_crossings.sum()
+                                    + _interval_counts(cross_lo, cross_hi, crossing_sign, r))
+
+        on_simplex = np.add.outer(np.arange(r + 1), np.arange(r + 1)) <= r
+        n_points = X.shape[0]
+        weights = weight_simplex(r)
+        return SweepResult(weights, self._mean_boringness(weights),
+                           above_count[on_simplex] / n_points, flips[on_simplex] / n_points,
+                           crossing_flips[on_simplex] / n_points)
+
+    def above(self, B):
+        """Above-threshold mask of B (..., trajectories, time), the rule both sweep paths use"""
+        return B > self.threshold + self.tolerance
+
+    def _mean_boringness(self, weights):
+        """Mean B per weight vector; linear, so one product with the mean features"""
+        return weights @ self.features.reshape(-1, self.features.shape[-1]).mean(axis=0)
+
+    def weight_gradient(self):
+        """∂B/∂(α, β, γ) at every point, (trajectories, time, 3)"""
+        return self.features
+
+    def simplex_gradient(self):
+        """The weight gradient projected onto the simplex (directions with Σ dw = 0)"""
+        return self.features - self.features.mean(axis=-1, keepdims=True)
+
+    def input_partials(self, weights=None):
+        """∂B/∂H, ∂B/∂VCI and ∂B/∂C at every point, each (trajectories, time)"""
+        alpha, beta, gamma = self.baseline if weights is None else weights
+        with np.errstate(divide='ignore'):
+            dH = -alpha / self.H ** 2
+            dC = -gamma / self.counterplay_index ** 2
+        return dH, np.full(self.H.shape, float(beta)), dC
+
+    def flip_margin(self, weights=None):
+        """
+        Smallest weight change (Euclidean, within the simplex) that moves each
+        point across the threshold: |B - threshold| / ‖projected gradient‖.
+        """
+        weights = self.baseline if weights is None else np.asarray(weights, dtype=np.float64)
+        gap = np.abs(self.boringness(weights)[0] - self.threshold)
+        norm = np.linalg.norm(self.simplex_gradient(), axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(norm > 0, gap / norm, np.inf)
+
+    def schedule_flip_rate(self, weights, cost=1.0, window=10, budget=None):
+        """
+        Share of trajectories whose InterventionScheduler plan changes from the
+        baseline plan, for a handful of (W, 3) weights (full DP per weight).
+        """
+        scheduler = InterventionScheduler(cost, window, self.threshold, budget)
+        baseline = [schedule.times for schedule in scheduler.plan(self.boringness(self.baseline)[0])]
+        rates = np.empty(len(np.atleast_2d(weights)))
+        for w, B in enumerate(self.boringness(weights)):
+            plans = scheduler.plan(B)
+            rates[w] = np.mean([not np.array_equal(plan.times, reference)
+                                for plan, reference in zip(plans, baseline)])
+        return rates
+
+
+def _above_interval(offset, slope, top):
+    """[lo, hi] of the integers j in 0..top with offset + slope·j > 0 (empty when lo > hi)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Clipped so huge ratios from tiny slopes stay castable
+        cut = np.clip(-offset / slope, -1.0, top + 1.0)
+    lo = np.where(slope > 0, np.floor(cut) + 1, 0)
+    hi = np.where(slope < 0, np.ceil(cut) - 1, top)
+    flat = slope == 0
+    hi = np.where(flat & (offset <= 0), -1, hi)
+    lo = np.where(flat, 0, lo)
+    return np.maximum(lo, 0).astype(np.int64), np.minimum(hi, top).astype(np.int64)
+
+
+def _interval_counts(lo, hi, weight, r):
+    """(rows, r + 1) sums of weight·[lo <= j <= hi] over the point axis, via difference arrays"""
+    n_rows = lo.shape[0]
+    valid = lo <= hi
+    weight = np.broadcast_to(weight, lo.shape) * valid
+    width = r + 2
+    offsets = (np.arange(n_rows) * width)[:, None]
+    diff = (np.bincount((offsets + np.minimum(lo, r + 1)).ravel(), weights=weight.ravel(),
+                        minlength=n_rows * width)
+            - np.bincount((offsets + np.clip(hi + 1, 0, r + 1)).ravel(), weights=weight.ravel(),
+                          minlength=n_rows * width))
+    return np.cumsum(diff.reshape(n_rows, width), axis=1)[:, :r + 1]
+
+
+def _upcrossings(above):
+    """Steps where B rises above the threshold (a trajectory starting above counts at t=0)"""
+    crossings = above.copy()
+    crossings[..., 1:] &= ~above[..., :-1]
+    return crossings